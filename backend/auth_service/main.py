@@ -1,19 +1,52 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from database.base import get_db
+from database.base import engine, get_db
+from database.instrumentation import QUERY_STATS_HEADERS, QueryStatsMiddleware
+from database.pool_metrics import pool_status
+from database.routing import replicas
 from routers.auth import router as auth_router
 from routers.courses import router as courses_router
+from utils.auth_middleware import AuthPrincipalMiddleware
+from utils import cache as read_cache
+from utils.last_login_buffer import last_login_buffer
+from utils.pagination import NEXT_CURSOR_HEADER
+import logging
+import os
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-# Add CORS middleware
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background writer for coalesced last_login updates
+    last_login_buffer.start()
+    yield
+    last_login_buffer.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+# Verify the bearer token once per request, before routing (NFRE-4.1)
+app.add_middleware(AuthPrincipalMiddleware)
+
+# Per-request SQL statement count / DB time (headers when SQL_STATS_HEADERS=true)
+app.add_middleware(QueryStatsMiddleware)
+
+# Compress bodies above the threshold (100-item pages, exports); 304s and small bodies pass through
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1024")))
+
+# Add CORS middleware (added last so it wraps auth and 401s still carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # dev: allow all origins to fix CORS policy errors
     allow_credentials=False,  # no cookies used, so disable credentials
     allow_methods=["*"],
     allow_headers=["*"],
+    # let browsers read the pagination cursor, list ETags and the SQL_STATS_HEADERS timings
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", *QUERY_STATS_HEADERS],
 )
 
 # Include routers
@@ -24,6 +57,14 @@ app.include_router(courses_router)
 from routers.assignments import router as assignments_router
 app.include_router(assignments_router)
 
+# Full-text search across courses and assignments
+from routers.search import router as search_router
+app.include_router(search_router)
+
+# Dashboard first paint in one request
+from routers.dashboard import router as dashboard_router
+app.include_router(dashboard_router)
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the FastAPI application!"}
@@ -31,7 +72,27 @@ def read_root():
 @app.get("/health/db")
 def health_db(db: Session = Depends(get_db)):
     try:
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         return {"db": "ok"}
     except Exception:
-        raise HTTPException(status_code=503, detail="DB connection failed")
\ No newline at end of file
+        raise HTTPException(status_code=503, detail="DB connection failed")
+
+@app.get("/health/ready")
+def health_ready():
+    """Readiness probe: DB round trip plus live pool telemetry (NFRE-2.2)"""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        db_status = "ok"
+    except Exception as e:
+        logger.error(f"Readiness check failed: {str(e)}")
+        db_status = "unavailable"
+
+    body = {"db": db_status, "pool": pool_status(engine), "cache": read_cache.cache.stats()}
+    if replicas is not None:
+        body["replicas"] = [
+            dict(replica, pool=pool_status(replica_engine))
+            for replica, replica_engine in zip(replicas.status(), replicas.engines)
+        ]
+        body["replica_fallbacks"] = replicas.fallbacks
+    return JSONResponse(body, status_code=200 if db_status == "ok" else 503)
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Query-plan regression benchmark (NFRE-1.4)
+
+Seeds a database with synthetic users/courses/assignments, calls the read endpoints
+through the real app with locally minted Firebase tokens, captures every SQL statement
+they issue and runs EXPLAIN on it. Fails (exit 1) if any statement full-scans a hot
+table instead of using an index.
+
+    cd backend
+    python benchmarks/query_plans.py                      # temp SQLite database
+    python benchmarks/query_plans.py --database-url postgresql://...  # migrated Postgres
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+HOT_TABLES = ("assignments", "courses", "users", "course_stats", "assignment_due_histogram")
+PROJECT_ID = "benchmark-project"
+KEY_ID = "benchmark-key"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="Database to seed (default: temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--courses", type=int, default=8, help="Courses per user")
+    parser.add_argument("--assignments", type=int, default=100, help="Assignments per course")
+    parser.add_argument("--runs", type=int, default=20, help="Timed requests per endpoint")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if an endpoint's median exceeds this")
+    return parser.parse_args()
+
+
+def configure_environment(args, workdir):
+    """Must run before any app module is imported - they read configuration at import time"""
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    os.environ["FIREBASE_LOCAL_KEYS_FILE"] = os.path.join(workdir, "keys.json")
+    os.environ["FIREBASE_PROJECT_ID"] = PROJECT_ID
+    os.environ["FIREBASE_TOKEN_VERIFIER"] = "local"
+    os.environ.pop("FIREBASE_ADMIN_CREDENTIAL", None)
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+
+
+def seed(engine, users, courses_per_user, assignments_per_course):
+    from database.models import Assignment, Course, User
+
+    with engine.begin() as connection:
+        if connection.execute(User.__table__.select().limit(1)).first() is not None:
+            print("Database already seeded - reusing existing rows")
+            return
+
+        now = datetime.utcnow()
+        rng = random.Random(42)
+        connection.execute(User.__table__.insert(), [
+            {"id": u + 1, "email": f"bench{u}@example.com", "firebase_uid": f"bench-user-{u}",
+             "full_name": f"Bench User {u}", "is_active": True, "role": "student", "created_at": now}
+            for u in range(users)
+        ])
+        course_rows = [
+            {"id": u * courses_per_user + c + 1, "name": f"Course {c}", "term": "Fall", "description": "",
+             "user_id": u + 1, "created_at": now - timedelta(days=c)}
+            for u in range(users) for c in range(courses_per_user)
+        ]
+        connection.execute(Course.__table__.insert(), course_rows)
+
+        batch = []
+        for course in course_rows:
+            for a in range(assignments_per_course):
+                batch.append({
+                    "title": f"Assignment {a}", "description": "synthetic", "prompt": "Write an essay",
+                    "due_date": now + timedelta(hours=rng.randint(-24 * 60, 24 * 120)),
+                    "course_id": course["id"], "created_at": now,
+                })
+                if len(batch) >= 5000:
+                    connection.execute(Assignment.__table__.insert(), batch)
+                    batch = []
+        if batch:
+            connection.execute(Assignment.__table__.insert(), batch)
+
+    from crud.stats import rebuild_stats
+    from database.base import SessionLocal
+    db = SessionLocal()
+    try:
+        rebuild_stats(db)
+        db.commit()
+    finally:
+        db.close()
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    print(f"Seeded {users} users, {len(course_rows)} courses, "
+          f"{len(course_rows) * assignments_per_course} assignments")
+
+
+def plan_violations(engine, statement, parameters):
+    """EXPLAIN one captured statement; return descriptions of full scans on hot tables"""
+    violations = []
+    with engine.connect() as connection:
+        if engine.dialect.name == "sqlite":
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            for row in rows:
+                detail = row[-1]
+                match = re.match(r"SCAN (\w+)", detail)
+                if match and match.group(1) in HOT_TABLES and "INDEX" not in detail:
+                    violations.append(detail)
+        elif engine.dialect.name == "postgresql":
+            plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            stack = [plan[0]["Plan"]]
+            while stack:
+                node = stack.pop()
+                if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in HOT_TABLES:
+                    violations.append(f"Seq Scan on {node['Relation Name']}")
+                stack.extend(node.get("Plans", []))
+    return violations
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="query_plans_")
+    configure_environment(args, workdir)
+
+    from sqlalchemy import event
+    from fastapi.testclient import TestClient
+    from utils.local_token_verifier import generate_local_keypair, mint_token
+    private_key = generate_local_keypair(os.environ["FIREBASE_LOCAL_KEYS_FILE"], kid=KEY_ID)
+
+    from database.base import Base, engine
+    from database.models import Assignment, Course
+    from auth_service.main import app
+
+    Base.metadata.create_all(engine)
+    seed(engine, args.users, args.courses, args.assignments)
+
+    with engine.connect() as connection:
+        course_id = connection.execute(Course.__table__.select().where(Course.user_id == 1).limit(1)).first().id
+        assignment_id = connection.execute(
+            Assignment.__table__.select().where(Assignment.course_id == course_id).limit(1)
+        ).first().id
+
+    token = mint_token(private_key, KEY_ID, PROJECT_ID, "bench-user-0", email="bench0@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    # A cursor from a few pages in, to check deep pages use the same index range scan
+    client = TestClient(app)
+    cursor_params = {"sort_by": "due_date", "limit": 20}
+    for _ in range(5):
+        page = client.get("/assignments/", params=cursor_params, headers=headers)
+        cursor_params = dict(cursor_params, cursor=page.headers["X-Next-Cursor"])
+
+    endpoints = [
+        ("/courses/", {}),
+        ("/courses/", {"limit": 5}),
+        ("/courses/", {"expand": "summary"}),
+        (f"/courses/{course_id}/assignments", {}),
+        ("/assignments/", {}),
+        ("/assignments/", {"sort_by": "title", "order": "desc"}),
+        ("/assignments/", cursor_params),
+        ("/assignments/", {"status": "due_soon"}),
+        ("/assignments/", {"course_id": course_id}),
+        ("/assignments/", {"search": "assignment 3"}),
+        ("/search/", {"q": "course 1"}),
+        ("/assignments/stats", {}),
+        ("/assignments/upcoming", {}),
+        ("/assignments/overdue", {}),
+        (f"/assignments/{assignment_id}", {}),
+        ("/auth/profile", {}),
+        ("/dashboard", {}),
+    ]
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    failures = []
+    client.get("/auth/profile", headers=headers)  # warm the token and identity caches
+
+    print(f"\n{'endpoint':<45} {'queries':>7} {'median ms':>10} {'p95 ms':>8}  plan")
+    for path, params in endpoints:
+        captured.clear()
+        event.listen(engine, "before_cursor_execute", capture)
+        response = client.get(path, params=params, headers=headers)
+        event.remove(engine, "before_cursor_execute", capture)
+        label = path + ("?" + "&".join(f"{k}={'<cursor>' if k == 'cursor' else v}" for k, v in params.items()) if params else "")
+        if response.status_code != 200:
+            failures.append(f"{label}: HTTP {response.status_code} {response.text[:200]}")
+            continue
+
+        violations = []
+        for statement, parameters in captured:
+            violations.extend(f"{v}\n      in: {' '.join(statement.split())[:160]}"
+                              for v in plan_violations(engine, statement, parameters))
+
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            client.get(path, params=params, headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        p95 = sorted(timings)[max(int(len(timings) * 0.95) - 1, 0)]
+
+        print(f"{label:<45} {len(captured):>7} {median:>10.2f} {p95:>8.2f}  {'FULL SCAN' if violations else 'ok'}")
+        failures.extend(f"{label}: {v}" for v in violations)
+        if args.max_ms is not None and median > args.max_ms:
+            failures.append(f"{label}: median {median:.1f} ms exceeds {args.max_ms} ms")
+
+    if failures:
+        print("\nQuery plan regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nAll statements use indexes on hot tables")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,187 @@
 # CRUD operations for Assignment management - FRE-2.1, 2.2, 2.3
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Date, DateTime, Row, delete, func, insert, select, type_coerce, update
 from fastapi import HTTPException, status
-from database.models import Assignment, Course
-from schemas.assignment import AssignmentCreate, AssignmentUpdate
-from typing import List, Optional
+from database.models import Assignment, Course, Draft, Feedback
+from schemas.assignment import AssignmentCreate, AssignmentSelection, AssignmentUpdate
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple, Union
+from utils.pagination import keyset_page
+from crud import stats
+from crud.returning import commit_detached, insert_returning, supports_returning, update_returning
+from crud.stats import STATUS_COUNT_KEYS, status_count_columns
+from utils.cache import CACHE_TIME_RELATIVE_TTL, cached
+from utils.datetimes import naive_utc
+
+# Columns accepted by the sort_by query parameter; unknown values fall back to due_date
+ASSIGNMENT_SORT_COLUMNS = {
+    "due_date": Assignment.due_date,
+    "title": Assignment.title,
+    "created_at": Assignment.created_at,
+}
+
+# Stored attributes a sparse fieldset may select; computed fields are derived from due_date
+ASSIGNMENT_COLUMNS = {
+    column.key: column for column in (
+        Assignment.id, Assignment.title, Assignment.description, Assignment.prompt,
+        Assignment.due_date, Assignment.course_id, Assignment.created_at, Assignment.updated_at,
+    )
+}
+
+def assignment_columns(fields, sort_by: str = "due_date") -> list:
+    """
+    Columns to SELECT for the given response fields: id and due_date always (identity and the
+    computed fields), plus the sort column the keyset cursor is read from
+    """
+    names = {"id", "due_date", sort_by if sort_by in ASSIGNMENT_SORT_COLUMNS else "due_date"}
+    names.update(name for name in fields if name in ASSIGNMENT_COLUMNS)
+    return [column for key, column in ASSIGNMENT_COLUMNS.items() if key in names]
 
 def get_assignments_by_course(db: Session, course_id: int) -> List[Assignment]:
     """Get all assignments for a specific course (FRE-2.1)"""
     return db.query(Assignment).filter(Assignment.course_id == course_id).order_by(Assignment.due_date.asc()).all()
 
+def paginate_assignments(query, sort_by: str, order: str, limit: Optional[int], cursor: Optional[str] = None,
+                         offset: int = 0) -> Tuple[List[Union[Assignment, Row]], Optional[str]]:
+    """Keyset-paginate an Assignment query by sort_by with id as the tie-breaker"""
+    if sort_by not in ASSIGNMENT_SORT_COLUMNS:
+        sort_by = "due_date"
+    order = "desc" if order == "desc" else "asc"
+    return keyset_page(query, ASSIGNMENT_SORT_COLUMNS[sort_by], Assignment.id, sort_by, order, limit, cursor, offset)
+
+def get_assignments_by_course_page(db: Session, course_id: int, sort_by: str, order: str, limit: Optional[int], cursor: Optional[str] = None,
+                                   columns: Optional[list] = None) -> Tuple[List[Union[Assignment, Row]], Optional[str]]:
+    """Page of a course's assignments plus the cursor for the next page (FRE-2.1); with columns, plain rows of just those"""
+    query = db.query(*(columns or [Assignment])).filter(Assignment.course_id == course_id)
+    return paginate_assignments(query, sort_by, order, limit, cursor)
+
 def get_assignment_by_id(db: Session, assignment_id: int) -> Optional[Assignment]:
     """Get a single assignment by ID"""
     return db.query(Assignment).filter(Assignment.id == assignment_id).first()
 
-def create_assignment(db: Session, assignment: AssignmentCreate) -> Assignment:
-    """Create a new assignment (FRE-2.2)"""
+# --- Ownership-scoped access: the owner check is part of the statement itself ---
+
+def owned_by(user_id: int):
+    """Predicate limiting Assignment rows to courses owned by user_id"""
+    return Assignment.course_id.in_(select(Course.id).where(Course.user_id == user_id))
+
+@cached("owned-assignment")
+def get_owned_assignment(db: Session, user_id: int, assignment_id: int) -> Optional[Assignment]:
+    """
+    Load an assignment only if user_id owns its course - one query, None otherwise. Cached:
+    without a shared cache tier other workers may serve it up to CACHE_LOCAL_TTL stale
+    """
+    return db.scalars(
+        select(Assignment).join(Course, Course.id == Assignment.course_id).where(
+            Assignment.id == assignment_id,
+            Course.user_id == user_id
+        )
+    ).first()
+
+def update_owned_assignment(db: Session, user_id: int, assignment_id: int, assignment_update: AssignmentUpdate) -> Optional[Assignment]:
+    """
+    UPDATE ... WHERE id AND owner; returns the updated row, or None when the assignment
+    does not exist or belongs to someone else (FRE-2.3)
+    """
+    try:
+        update_data = assignment_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return get_owned_assignment(db, user_id, assignment_id)
+        
+        if "due_date" in update_data:
+            # The histogram needs the old due day; this read doubles as the ownership check
+            current = db.execute(
+                select(Assignment.course_id, Assignment.due_date).where(Assignment.id == assignment_id, owned_by(user_id))
+            ).first()
+            if current is None:
+                return None
+            stats.apply(db, stats.due_date_moved(db, user_id, current.course_id, current.due_date, update_data["due_date"]))
+        else:
+            # Rolled back below if the assignment turns out not to be the user's
+            stats.apply(db, stats.data_changed(db, user_id))
+        
+        criteria = [Assignment.id == assignment_id, owned_by(user_id)]
+        if supports_returning(db):
+            db_assignment = update_returning(db, Assignment, criteria, update_data)
+            if db_assignment is None:
+                db.rollback()
+                return None
+            return commit_detached(db, db_assignment)
+        
+        stmt = update(Assignment).where(*criteria).values(**update_data)
+        if db.execute(stmt, execution_options={"synchronize_session": False}).rowcount == 0:
+            db.rollback()
+            return None
+        db.commit()
+        return get_owned_assignment(db, user_id, assignment_id)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update assignment"
+        )
+
+def delete_owned_assignment(db: Session, user_id: int, assignment_id: int) -> bool:
+    """DELETE ... WHERE id AND owner, including its drafts and feedback; False if nothing matched (FRE-2.3)"""
+    try:
+        owned_assignment = select(Assignment.id).where(Assignment.id == assignment_id, owned_by(user_id))
+        owned_drafts = select(Draft.id).where(Draft.assignment_id.in_(owned_assignment))
+        sync = {"synchronize_session": False}
+        
+        # Core deletes skip the ORM cascade, so remove dependents first
+        db.execute(delete(Feedback).where(Feedback.draft_id.in_(owned_drafts)), execution_options=sync)
+        db.execute(delete(Draft).where(Draft.assignment_id.in_(owned_assignment)), execution_options=sync)
+        
+        stmt = delete(Assignment).where(Assignment.id == assignment_id, owned_by(user_id))
+        if db.get_bind().dialect.delete_returning:
+            deleted = db.execute(stmt.returning(Assignment.course_id, Assignment.due_date), execution_options=sync).first()
+        else:
+            deleted = db.execute(
+                select(Assignment.course_id, Assignment.due_date).where(Assignment.id == assignment_id, owned_by(user_id))
+            ).first()
+            if deleted is not None:
+                db.execute(stmt, execution_options=sync)
+        
+        if deleted is None:
+            db.rollback()
+            return False
+        stats.apply(db, stats.assignments_changed(db, user_id, deleted.course_id, deleted.due_date, -1))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete assignment with existing drafts"
+        )
+
+def create_assignment(db: Session, assignment: AssignmentCreate, user_id: Optional[int] = None) -> Assignment:
+    """Create a new assignment (FRE-2.2); with user_id the course must belong to that user"""
     try:
-        # Verify course exists
-        course = db.query(Course).filter(Course.id == assignment.course_id).first()
+        # Verify course exists (and is owned by user_id, in the same query)
+        course_query = db.query(Course).filter(Course.id == assignment.course_id)
+        if user_id is not None:
+            course_query = course_query.filter(Course.user_id == user_id)
+        course = course_query.first()
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found"
+                detail="Course not found" if user_id is None else "Course not found or access denied"
             )
         
-        db_assignment = Assignment(
+        values = dict(
             title=assignment.title,
             description=assignment.description or "",
             prompt=assignment.prompt,
             due_date=assignment.due_date,
             course_id=assignment.course_id
         )
+        stats.apply(db, stats.assignments_changed(db, course.user_id, course.id, assignment.due_date))
+        if supports_returning(db):
+            return commit_detached(db, insert_returning(db, Assignment, values))
+        
+        db_assignment = Assignment(**values)
         db.add(db_assignment)
         db.commit()
         db.refresh(db_assignment)
@@ -43,14 +193,207 @@ def create_assignment(db: Session, assignment: AssignmentCreate) -> Assignment:
             detail="Failed to create assignment"
         )
 
+def bulk_create_assignments(db: Session, user_id: int, assignments: List[Tuple[int, AssignmentCreate]],
+                            partial: bool = False) -> Tuple[int, List[int], List[dict]]:
+    """
+    Insert validated (row, assignment) pairs in one transaction (FRE-2.2). Ownership is
+    checked with one query over the distinct course ids; rows pointing at other courses
+    are reported as errors. Unless partial, any error rolls back the whole batch.
+    Returns the number inserted, the new ids in input order (empty without RETURNING support)
+    and the row errors
+    """
+    course_ids = {assignment.course_id for _, assignment in assignments}
+    owned = set(db.scalars(select(Course.id).where(Course.id.in_(course_ids), Course.user_id == user_id))) if course_ids else set()
+
+    errors = [
+        {"row": row, "field": "course_id", "message": "Course not found or access denied"}
+        for row, assignment in assignments if assignment.course_id not in owned
+    ]
+    accepted = [assignment for _, assignment in assignments if assignment.course_id in owned]
+    if not accepted or (errors and not partial):
+        return 0, [], errors
+
+    try:
+        values = [
+            dict(
+                title=assignment.title,
+                description=assignment.description or "",
+                prompt=assignment.prompt,
+                due_date=assignment.due_date,
+                course_id=assignment.course_id
+            )
+            for assignment in accepted
+        ]
+        # One grouped stats delta per (course, due day) instead of one per row
+        groups = {}
+        for assignment in accepted:
+            key = (assignment.course_id, stats.due_day(assignment.due_date))
+            groups[key] = groups.get(key, 0) + 1
+        stats.apply(db, stats.day_counts_changed(db, user_id, [(*key, count) for key, count in groups.items()]))
+
+        # executemany; SQLAlchemy batches it into multi-row INSERT ... VALUES statements
+        if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            ids = list(db.scalars(insert(Assignment).returning(Assignment.id, sort_by_parameter_order=True), values))
+        else:
+            db.execute(insert(Assignment), values)
+            ids = []
+        db.commit()
+        return len(accepted), ids, errors
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to import assignments"
+        )
+
+# --- Set-based bulk operations: one UPDATE/DELETE over every selected, owned row ---
+
+def selection_criteria(user_id: int, selection: AssignmentSelection) -> list:
+    """WHERE clauses for the assignments a bulk request selects, always including the owner check"""
+    criteria = [owned_by(user_id)]
+    if selection.ids is not None:
+        criteria.append(Assignment.id.in_(selection.ids))
+    if selection.course_id is not None:
+        criteria.append(Assignment.course_id == selection.course_id)
+    if selection.due_from is not None:
+        criteria.append(Assignment.due_date >= naive_utc(selection.due_from))
+    if selection.due_to is not None:
+        criteria.append(Assignment.due_date <= naive_utc(selection.due_to))
+    return criteria
+
+def _day_counts(db: Session, criteria: list) -> list:
+    """(course_id, due day, count) for the selected rows - what the stats histogram needs to move"""
+    day = func.date(Assignment.due_date, type_=Date)
+    return db.execute(
+        select(Assignment.course_id, day, func.count(Assignment.id)).where(*criteria).group_by(Assignment.course_id, day)
+    ).all()
+
+def _shifted(db: Session, column, days: int):
+    """
+    column + days in SQL. SQLite keeps DateTime as text and compares it as text, so the result
+    must keep SQLAlchemy's storage format: seconds from strftime, then the original six-digit
+    fraction (characters 20 onward, ".ffffff")
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return type_coerce(
+            func.strftime("%Y-%m-%d %H:%M:%S", column, f"{days:+d} days").concat(func.substr(column, 20)),
+            DateTime
+        )
+    return column + timedelta(days=days)
+
+def _update_selected(db: Session, criteria: list, values: dict) -> List[int]:
+    """One UPDATE over the selection; returns the affected ids"""
+    stmt = update(Assignment).where(*criteria).values(**values)
+    sync = {"synchronize_session": False}
+    if db.get_bind().dialect.update_returning:
+        return list(db.scalars(stmt.returning(Assignment.id), execution_options=sync))
+    # Read the ids before the UPDATE can move rows out of a due-date selection
+    ids = list(db.scalars(select(Assignment.id).where(*criteria)))
+    db.execute(stmt, execution_options=sync)
+    return ids
+
+def shift_owned_assignments(db: Session, user_id: int, selection: AssignmentSelection, days: int) -> List[int]:
+    """Move the due date of every selected assignment by `days` in one statement (FRE-2.3)"""
+    try:
+        criteria = selection_criteria(user_id, selection)
+        moves = []
+        for course_id, day, count in _day_counts(db, criteria):
+            moves += [(course_id, day + timedelta(days=days), count), (course_id, day, -count)]
+        if not moves:
+            return []
+        
+        stats.apply(db, stats.day_counts_changed(db, user_id, moves))
+        ids = _update_selected(db, criteria, {"due_date": _shifted(db, Assignment.due_date, days)})
+        db.commit()
+        return ids
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update assignments"
+        )
+
+def update_owned_assignments(db: Session, user_id: int, selection: AssignmentSelection, assignment_update: AssignmentUpdate) -> List[int]:
+    """Apply the same field changes to every selected assignment in one statement (FRE-2.3)"""
+    try:
+        criteria = selection_criteria(user_id, selection)
+        update_data = assignment_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return list(db.scalars(select(Assignment.id).where(*criteria)))
+        
+        if "due_date" in update_data:
+            new_day = stats.due_day(update_data["due_date"])
+            moves = []
+            for course_id, day, count in _day_counts(db, criteria):
+                moves += [(course_id, new_day, count), (course_id, day, -count)]
+            stats.apply(db, stats.day_counts_changed(db, user_id, moves))
+        else:
+            stats.apply(db, stats.data_changed(db, user_id))
+        
+        ids = _update_selected(db, criteria, update_data)
+        db.commit()
+        return ids
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update assignments"
+        )
+
+def delete_owned_assignments(db: Session, user_id: int, selection: AssignmentSelection) -> List[int]:
+    """Delete every selected assignment with its drafts and feedback; returns the deleted ids (FRE-2.3)"""
+    try:
+        criteria = selection_criteria(user_id, selection)
+        day_counts = _day_counts(db, criteria)
+        if not day_counts:
+            return []
+        
+        selected = select(Assignment.id).where(*criteria)
+        owned_drafts = select(Draft.id).where(Draft.assignment_id.in_(selected))
+        sync = {"synchronize_session": False}
+        # Core deletes skip the ORM cascade, so remove dependents first
+        db.execute(delete(Feedback).where(Feedback.draft_id.in_(owned_drafts)), execution_options=sync)
+        db.execute(delete(Draft).where(Draft.assignment_id.in_(selected)), execution_options=sync)
+        
+        stmt = delete(Assignment).where(*criteria)
+        if db.get_bind().dialect.delete_returning:
+            ids = list(db.scalars(stmt.returning(Assignment.id), execution_options=sync))
+        else:
+            ids = list(db.scalars(selected))
+            db.execute(stmt, execution_options=sync)
+        
+        stats.apply(db, stats.day_counts_changed(db, user_id, [(course_id, day, -count) for course_id, day, count in day_counts]))
+        db.commit()
+        return ids
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete assignments with existing drafts"
+        )
+
 def update_assignment(db: Session, assignment_id: int, assignment_update: AssignmentUpdate) -> Optional[Assignment]:
     """Update an existing assignment (FRE-2.3)"""
     try:
+        update_data = assignment_update.model_dump(exclude_unset=True)
+        # A due-date change needs the old value for the stats histogram, so it takes the ORM path
+        if update_data and "due_date" not in update_data and supports_returning(db):
+            db_assignment = update_returning(db, Assignment, [Assignment.id == assignment_id], update_data)
+            if db_assignment is not None:
+                owner_id = db.scalar(select(Course.user_id).where(Course.id == db_assignment.course_id))
+                stats.apply(db, stats.data_changed(db, owner_id))
+            return commit_detached(db, db_assignment)
+        
         db_assignment = get_assignment_by_id(db, assignment_id)
         if not db_assignment:
             return None
         
-        update_data = assignment_update.model_dump(exclude_unset=True)
+        if "due_date" in update_data:
+            stats.apply(db, stats.due_date_moved(
+                db, db_assignment.course.user_id, db_assignment.course_id, db_assignment.due_date, update_data["due_date"]
+            ))
+        elif update_data:
+            stats.apply(db, stats.data_changed(db, db_assignment.course.user_id))
         for field, value in update_data.items():
             setattr(db_assignment, field, value)
         
@@ -71,6 +414,9 @@ def delete_assignment(db: Session, assignment_id: int) -> bool:
         if not db_assignment:
             return False
         
+        stats.apply(db, stats.assignments_changed(
+            db, db_assignment.course.user_id, db_assignment.course_id, db_assignment.due_date, -1
+        ))
         db.delete(db_assignment)
         db.commit()
         return True
@@ -87,29 +433,31 @@ def get_assignments_by_user(db: Session, user_id: int) -> List[Assignment]:
         Course.user_id == user_id
     ).order_by(Assignment.due_date.asc()).all()
 
-def get_upcoming_assignments(db: Session, user_id: Optional[int] = None, course_id: Optional[int] = None, limit: int = 10) -> List[Assignment]:
-    """Get upcoming assignments, optionally filtered by user or course"""
+@cached("upcoming-assignments", ttl=CACHE_TIME_RELATIVE_TTL)
+def get_upcoming_assignments(db: Session, user_id: Optional[int] = None, course_id: Optional[int] = None, limit: int = 10, columns: Optional[list] = None) -> List[Union[Assignment, Row]]:
+    """Get upcoming assignments, optionally filtered by user or course; with columns, plain rows of just those"""
     from datetime import datetime
     
-    query = db.query(Assignment).filter(Assignment.due_date > datetime.now())
+    query = db.query(*(columns or [Assignment])).filter(Assignment.due_date > datetime.now())
     
     if user_id:
         # Filter by user's courses
-        query = query.join(Course).filter(Course.user_id == user_id)
+        query = query.join(Course, Course.id == Assignment.course_id).filter(Course.user_id == user_id)
     elif course_id:
         query = query.filter(Assignment.course_id == course_id)
     
     return query.order_by(Assignment.due_date.asc()).limit(limit).all()
 
-def get_overdue_assignments(db: Session, user_id: Optional[int] = None, course_id: Optional[int] = None) -> List[Assignment]:
-    """Get overdue assignments, optionally filtered by user or course"""
+@cached("overdue-assignments", ttl=CACHE_TIME_RELATIVE_TTL)
+def get_overdue_assignments(db: Session, user_id: Optional[int] = None, course_id: Optional[int] = None, columns: Optional[list] = None) -> List[Union[Assignment, Row]]:
+    """Get overdue assignments, optionally filtered by user or course; with columns, plain rows of just those"""
     from datetime import datetime
     
-    query = db.query(Assignment).filter(Assignment.due_date < datetime.now())
+    query = db.query(*(columns or [Assignment])).filter(Assignment.due_date < datetime.now())
     
     if user_id:
         # Filter by user's courses
-        query = query.join(Course).filter(Course.user_id == user_id)
+        query = query.join(Course, Course.id == Assignment.course_id).filter(Course.user_id == user_id)
     elif course_id:
         query = query.filter(Assignment.course_id == course_id)
     
@@ -136,26 +484,48 @@ def get_assignments_with_status(db: Session, user_id: int, status: str) -> List[
     
     return query.order_by(Assignment.due_date.asc()).all()
 
+def assignment_stats_statement(user_id: int, now: datetime):
+    """
+    One SELECT returning a row per course owned by user_id with its total/overdue/due_soon/upcoming
+    assignment counts, computed in a single pass with conditional aggregates.
+    Assignments are aggregated by course_id first so both tables are read through their
+    user_id / course_id indexes; the LEFT JOIN keeps courses that have no assignments
+    """
+    per_course = (
+        select(Assignment.course_id.label("course_id"), *status_count_columns(now))
+        .join(Course, Course.id == Assignment.course_id)
+        .where(Course.user_id == user_id)
+        .group_by(Assignment.course_id)
+        .subquery("per_course")
+    )
+    return (
+        select(Course.id, Course.name, *(func.coalesce(per_course.c[key], 0).label(key) for key in STATUS_COUNT_KEYS))
+        .outerjoin(per_course, per_course.c.course_id == Course.id)
+        .where(Course.user_id == user_id)
+    )
+
+def summarize_assignment_stats(rows) -> dict:
+    """Fold per-course rows from assignment_stats_statement into user-level totals"""
+    totals = {key: 0 for key in STATUS_COUNT_KEYS}
+    by_course = []
+    for row in sorted(rows, key=lambda row: row.id):
+        for key in STATUS_COUNT_KEYS:
+            totals[key] += getattr(row, key)
+        if row.total:
+            by_course.append({"course_id": row.id, "course_name": row.name, "count": row.total})
+    totals["courses"] = len(rows)
+    totals["by_course"] = by_course
+    return totals
+
+def get_assignment_stats(db: Session, user_id: int, now: Optional[datetime] = None) -> dict:
+    """
+    Course count, assignment counts by status and per-course counts in one aggregate scan
+    (source of truth for crud.stats; endpoints read the materialized crud.stats.get_user_stats)
+    """
+    rows = db.execute(assignment_stats_statement(user_id, now or datetime.now(timezone.utc))).all()
+    return summarize_assignment_stats(rows)
+
 def get_assignment_count_by_user(db: Session, user_id: int) -> dict:
     """Get assignment counts by status for a specific user"""
-    from datetime import datetime, timedelta
-    
-    now = datetime.now()
-    soon_threshold = now + timedelta(days=7)
-    
-    user_assignments = db.query(Assignment).join(Course).filter(Course.user_id == user_id)
-    
-    total = user_assignments.count()
-    overdue = user_assignments.filter(Assignment.due_date < now).count()
-    due_soon = user_assignments.filter(
-        Assignment.due_date >= now,
-        Assignment.due_date <= soon_threshold
-    ).count()
-    upcoming = user_assignments.filter(Assignment.due_date > soon_threshold).count()
-    
-    return {
-        "total": total,
-        "overdue": overdue,
-        "due_soon": due_soon,
-        "upcoming": upcoming
-    }
\ No newline at end of file
+    user_stats = stats.get_user_stats(db, user_id)
+    return {key: user_stats[key] for key in STATUS_COUNT_KEYS}
\ No newline at end of file
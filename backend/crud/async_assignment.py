@@ -0,0 +1,175 @@
+# Async CRUD operations for Assignment management (AsyncSession counterparts of crud/assignment.py)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from database.models import Assignment, Course, Draft
+from schemas.assignment import AssignmentCreate, AssignmentUpdate
+from crud import stats
+from crud.assignment import STATUS_COUNT_KEYS, assignment_stats_statement, summarize_assignment_stats
+from utils.datetimes import naive_utc
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+async def get_assignments_by_course(db: AsyncSession, course_id: int) -> List[Assignment]:
+    """Get all assignments for a specific course (FRE-2.1)"""
+    result = await db.scalars(
+        select(Assignment).where(Assignment.course_id == course_id).order_by(Assignment.due_date.asc())
+    )
+    return list(result.all())
+
+async def get_assignment_by_id(db: AsyncSession, assignment_id: int) -> Optional[Assignment]:
+    """Get a single assignment by ID"""
+    return await db.scalar(select(Assignment).where(Assignment.id == assignment_id))
+
+async def create_assignment(db: AsyncSession, assignment: AssignmentCreate) -> Assignment:
+    """Create a new assignment (FRE-2.2)"""
+    try:
+        # Verify course exists
+        course = await db.scalar(select(Course).where(Course.id == assignment.course_id))
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+        
+        db_assignment = Assignment(
+            title=assignment.title,
+            description=assignment.description or "",
+            prompt=assignment.prompt,
+            # asyncpg rejects aware values for the timestamp-without-time-zone column
+            due_date=naive_utc(assignment.due_date),
+            course_id=assignment.course_id
+        )
+        db.add(db_assignment)
+        await stats.apply_async(db, stats.assignments_changed(db, course.user_id, course.id, db_assignment.due_date))
+        await db.commit()
+        await db.refresh(db_assignment)
+        return db_assignment
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create assignment"
+        )
+
+async def update_assignment(db: AsyncSession, assignment_id: int, assignment_update: AssignmentUpdate) -> Optional[Assignment]:
+    """Update an existing assignment (FRE-2.3)"""
+    try:
+        db_assignment = await get_assignment_by_id(db, assignment_id)
+        if not db_assignment:
+            return None
+        
+        update_data = assignment_update.model_dump(exclude_unset=True)
+        if update_data.get("due_date") is not None:
+            update_data["due_date"] = naive_utc(update_data["due_date"])
+        if update_data:
+            owner_id = await db.scalar(select(Course.user_id).where(Course.id == db_assignment.course_id))
+            if "due_date" in update_data:
+                await stats.apply_async(db, stats.due_date_moved(
+                    db, owner_id, db_assignment.course_id, db_assignment.due_date, update_data["due_date"]
+                ))
+            else:
+                await stats.apply_async(db, stats.data_changed(db, owner_id))
+        for field, value in update_data.items():
+            setattr(db_assignment, field, value)
+        
+        await db.commit()
+        await db.refresh(db_assignment)
+        return db_assignment
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update assignment"
+        )
+
+async def delete_assignment(db: AsyncSession, assignment_id: int) -> bool:
+    """Delete an assignment (FRE-2.3)"""
+    try:
+        # Load the cascade up front - lazy loads are not allowed on an AsyncSession
+        db_assignment = await db.scalar(
+            select(Assignment).where(Assignment.id == assignment_id).options(
+                selectinload(Assignment.course),
+                selectinload(Assignment.drafts).selectinload(Draft.feedback)
+            )
+        )
+        if not db_assignment:
+            return False
+        
+        await stats.apply_async(db, stats.assignments_changed(
+            db, db_assignment.course.user_id, db_assignment.course_id, db_assignment.due_date, -1
+        ))
+        await db.delete(db_assignment)
+        await db.commit()
+        return True
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete assignment with existing drafts"
+        )
+
+async def get_assignments_by_user(db: AsyncSession, user_id: int) -> List[Assignment]:
+    """Get all assignments for courses owned by a specific user"""
+    result = await db.scalars(
+        select(Assignment).join(Course).where(Course.user_id == user_id).order_by(Assignment.due_date.asc())
+    )
+    return list(result.all())
+
+async def get_upcoming_assignments(db: AsyncSession, user_id: Optional[int] = None, course_id: Optional[int] = None, limit: int = 10) -> List[Assignment]:
+    """Get upcoming assignments, optionally filtered by user or course"""
+    stmt = select(Assignment).where(Assignment.due_date > datetime.now())
+    
+    if user_id:
+        # Filter by user's courses
+        stmt = stmt.join(Course).where(Course.user_id == user_id)
+    elif course_id:
+        stmt = stmt.where(Assignment.course_id == course_id)
+    
+    result = await db.scalars(stmt.order_by(Assignment.due_date.asc()).limit(limit))
+    return list(result.all())
+
+async def get_overdue_assignments(db: AsyncSession, user_id: Optional[int] = None, course_id: Optional[int] = None) -> List[Assignment]:
+    """Get overdue assignments, optionally filtered by user or course"""
+    stmt = select(Assignment).where(Assignment.due_date < datetime.now())
+    
+    if user_id:
+        # Filter by user's courses
+        stmt = stmt.join(Course).where(Course.user_id == user_id)
+    elif course_id:
+        stmt = stmt.where(Assignment.course_id == course_id)
+    
+    result = await db.scalars(stmt.order_by(Assignment.due_date.desc()))
+    return list(result.all())
+
+async def get_assignments_with_status(db: AsyncSession, user_id: int, status: str) -> List[Assignment]:
+    """Get assignments filtered by status for a specific user"""
+    now = datetime.now()
+    stmt = select(Assignment).join(Course).where(Course.user_id == user_id)
+    
+    if status == "overdue":
+        stmt = stmt.where(Assignment.due_date < now)
+    elif status == "due_soon":
+        soon_threshold = now + timedelta(days=7)
+        stmt = stmt.where(
+            Assignment.due_date >= now,
+            Assignment.due_date <= soon_threshold
+        )
+    elif status == "upcoming":
+        soon_threshold = now + timedelta(days=7)
+        stmt = stmt.where(Assignment.due_date > soon_threshold)
+    
+    result = await db.scalars(stmt.order_by(Assignment.due_date.asc()))
+    return list(result.all())
+
+async def get_assignment_stats(db: AsyncSession, user_id: int) -> dict:
+    """Course count, assignment counts by status and per-course counts in one query"""
+    result = await db.execute(assignment_stats_statement(user_id, datetime.now(timezone.utc)))
+    return summarize_assignment_stats(result.all())
+
+async def get_assignment_count_by_user(db: AsyncSession, user_id: int) -> dict:
+    """Get assignment counts by status for a specific user"""
+    counts = await get_assignment_stats(db, user_id)
+    return {key: counts[key] for key in STATUS_COUNT_KEYS}
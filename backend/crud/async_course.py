@@ -0,0 +1,81 @@
+# Async CRUD operations for Course management (AsyncSession counterparts of crud/course.py)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+from database.models import Assignment, Course, Draft
+from schemas.course import CourseCreate, CourseUpdate
+from typing import List, Optional
+from crud import stats
+
+async def get_courses(db: AsyncSession, user_id: Optional[int] = None) -> List[Course]:
+    """Get all courses, optionally filtered by user_id"""
+    stmt = select(Course)
+    if user_id:
+        stmt = stmt.where(Course.user_id == user_id)
+    result = await db.scalars(stmt.order_by(Course.created_at.desc()))
+    return list(result.all())
+
+async def get_course_by_id(db: AsyncSession, course_id: int) -> Optional[Course]:
+    """Get a single course by ID"""
+    return await db.scalar(select(Course).where(Course.id == course_id))
+
+async def create_course(db: AsyncSession, course: CourseCreate, user_id: Optional[int] = None) -> Course:
+    """Create a new course"""
+    try:
+        db_course = Course(
+            name=course.name,
+            term=course.term,
+            description=course.description or "",
+            user_id=user_id
+        )
+        db.add(db_course)
+        await db.flush()
+        await stats.apply_async(db, stats.course_created(db, user_id, db_course.id))
+        await db.commit()
+        await db.refresh(db_course)
+        return db_course
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Failed to create course")
+
+async def update_course(db: AsyncSession, course_id: int, course_update: CourseUpdate) -> Optional[Course]:
+    """Update an existing course"""
+    try:
+        db_course = await get_course_by_id(db, course_id)
+        if not db_course:
+            return None
+        
+        update_data = course_update.model_dump(exclude_unset=True)
+        if update_data:
+            await stats.apply_async(db, stats.data_changed(db, db_course.user_id))
+        for field, value in update_data.items():
+            setattr(db_course, field, value)
+        
+        await db.commit()
+        await db.refresh(db_course)
+        return db_course
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Failed to update course")
+
+async def delete_course(db: AsyncSession, course_id: int) -> bool:
+    """Delete a course by ID"""
+    try:
+        # Load the cascade up front - lazy loads are not allowed on an AsyncSession
+        db_course = await db.scalar(
+            select(Course).where(Course.id == course_id).options(
+                selectinload(Course.assignments).selectinload(Assignment.drafts).selectinload(Draft.feedback)
+            )
+        )
+        if not db_course:
+            return False
+        
+        await stats.apply_async(db, stats.course_deleted(db, db_course.user_id, db_course.id))
+        await db.delete(db_course)
+        await db.commit()
+        return True
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Cannot delete course with existing assignments")
@@ -1,10 +1,16 @@
 # CRUD operations for Course management
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, case, func, select
 from fastapi import HTTPException
-from database.models import Course
+from database.models import Assignment, Course
 from schemas.course import CourseCreate, CourseUpdate
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from utils.pagination import keyset_page
+from crud import stats
+from utils.cache import CACHE_TIME_RELATIVE_TTL, cached
+from crud.returning import commit_detached, insert_returning, supports_returning, update_returning
 
 def get_courses(db: Session, user_id: Optional[int] = None) -> List[Course]:
     """Get all courses, optionally filtered by user_id"""
@@ -13,6 +19,61 @@ def get_courses(db: Session, user_id: Optional[int] = None) -> List[Course]:
         query = query.filter(Course.user_id == user_id)
     return query.order_by(Course.created_at.desc()).all()
 
+@cached("courses-page")
+def get_courses_page(db: Session, user_id: int, limit: Optional[int], cursor: Optional[str] = None) -> Tuple[List[Course], Optional[str]]:
+    """Newest-first page of a user's courses plus the cursor for the next page"""
+    query = db.query(Course).filter(Course.user_id == user_id)
+    return keyset_page(query, Course.created_at, Course.id, "created_at", "desc", limit, cursor)
+
+@cached("course-summaries", ttl=CACHE_TIME_RELATIVE_TTL)
+def get_course_summaries(db: Session, user_id: int, course_ids: List[int], now: Optional[datetime] = None) -> Dict[int, dict]:
+    """
+    Assignment count, overdue count and next due assignment for each of the user's courses in
+    course_ids, in one statement: a grouped count joined with a ROW_NUMBER() pick per course
+    """
+    if not course_ids:
+        return {}
+    now = now or datetime.now(timezone.utc)
+    counts = (
+        select(
+            Assignment.course_id,
+            func.count(Assignment.id).label("assignment_count"),
+            func.count(case((Assignment.due_date < now, Assignment.id))).label("overdue_count"),
+        )
+        .where(Assignment.course_id.in_(course_ids))
+        .group_by(Assignment.course_id)
+        .subquery("counts")
+    )
+    # Served by the (course_id, due_date) index: each course's first row at or after now
+    upcoming = (
+        select(
+            Assignment.course_id, Assignment.id, Assignment.title, Assignment.due_date,
+            func.row_number().over(
+                partition_by=Assignment.course_id, order_by=(Assignment.due_date, Assignment.id)
+            ).label("position"),
+        )
+        .where(Assignment.course_id.in_(course_ids), Assignment.due_date >= now)
+        .subquery("upcoming")
+    )
+    rows = db.execute(
+        select(
+            Course.id, counts.c.assignment_count, counts.c.overdue_count,
+            upcoming.c.id.label("next_id"), upcoming.c.title.label("next_title"), upcoming.c.due_date.label("next_due_date"),
+        )
+        .outerjoin(counts, counts.c.course_id == Course.id)
+        .outerjoin(upcoming, and_(upcoming.c.course_id == Course.id, upcoming.c.position == 1))
+        .where(Course.id.in_(course_ids), Course.user_id == user_id)
+    ).all()
+    return {
+        row.id: {
+            "assignment_count": row.assignment_count or 0,
+            "overdue_count": row.overdue_count or 0,
+            "next_due": {"id": row.next_id, "title": row.next_title, "due_date": row.next_due_date}
+            if row.next_id is not None else None,
+        }
+        for row in rows
+    }
+
 def get_course_by_id(db: Session, course_id: int) -> Optional[Course]:
     """Get a single course by ID"""
     return db.query(Course).filter(Course.id == course_id).first()
@@ -20,13 +81,21 @@ def get_course_by_id(db: Session, course_id: int) -> Optional[Course]:
 def create_course(db: Session, course: CourseCreate, user_id: Optional[int] = None) -> Course:
     """Create a new course"""
     try:
-        db_course = Course(
+        values = dict(
             name=course.name,
             term=course.term,
             description=course.description or "",
             user_id=user_id
         )
+        if supports_returning(db):
+            db_course = insert_returning(db, Course, values)
+            stats.apply(db, stats.course_created(db, user_id, db_course.id))
+            return commit_detached(db, db_course)
+        
+        db_course = Course(**values)
         db.add(db_course)
+        db.flush()
+        stats.apply(db, stats.course_created(db, user_id, db_course.id))
         db.commit()
         db.refresh(db_course)
         return db_course
@@ -37,11 +106,19 @@ def create_course(db: Session, course: CourseCreate, user_id: Optional[int] = No
 def update_course(db: Session, course_id: int, course_update: CourseUpdate) -> Optional[Course]:
     """Update an existing course"""
     try:
+        update_data = course_update.model_dump(exclude_unset=True)
+        if update_data and supports_returning(db):
+            db_course = update_returning(db, Course, [Course.id == course_id], update_data)
+            if db_course is not None:
+                stats.apply(db, stats.data_changed(db, db_course.user_id))
+            return commit_detached(db, db_course)
+        
         db_course = get_course_by_id(db, course_id)
         if not db_course:
             return None
         
-        update_data = course_update.model_dump(exclude_unset=True)
+        if update_data:
+            stats.apply(db, stats.data_changed(db, db_course.user_id))
         for field, value in update_data.items():
             setattr(db_course, field, value)
         
@@ -59,6 +136,7 @@ def delete_course(db: Session, course_id: int) -> bool:
         if not db_course:
             return False
         
+        stats.apply(db, stats.course_deleted(db, db_course.user_id, db_course.id))
         db.delete(db_course)
         db.commit()
         return True
@@ -0,0 +1,33 @@
+# RETURNING-based write helpers shared by the CRUD modules
+# INSERT/UPDATE ... RETURNING hands back every column - server defaults and onupdate values
+# included - in the same round trip as the write, so responses are built without the
+# commit + refresh SELECT. Callers check supports_returning() and keep the ORM
+# add/commit/refresh path as the fallback for backends without RETURNING.
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+# Refresh objects already in the identity map from the returned row; do not try to
+# evaluate the WHERE clause against other loaded objects
+_RETURNING_OPTIONS = {"synchronize_session": False, "populate_existing": True}
+
+def supports_returning(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.insert_returning and dialect.update_returning
+
+def insert_returning(db: Session, model, values: dict):
+    """INSERT one row and return it as a fully loaded ORM object"""
+    return db.scalars(insert(model).values(**values).returning(model)).one()
+
+def update_returning(db: Session, model, criteria: list, values: dict):
+    """UPDATE rows matching criteria; returns the first updated object, or None if nothing matched"""
+    return db.scalars(
+        update(model).where(*criteria).values(**values).returning(model),
+        execution_options=_RETURNING_OPTIONS
+    ).first()
+
+def commit_detached(db: Session, obj):
+    """Commit without expiring obj - its attributes came from RETURNING, so detach it first"""
+    if obj is not None:
+        db.expunge(obj)
+    db.commit()
+    return obj
@@ -0,0 +1,90 @@
+# Ranked full-text search over assignments and courses (FRE-2.1, NFRE-1.4)
+# Matching goes through the indexes in database/search.py: tsvector @@ websearch_to_tsquery
+# (plus a trigram-indexed ILIKE on the title/name for substrings) on PostgreSQL, FTS5 MATCH
+# on SQLite. Cost follows the number of matching rows, not the size of the tables.
+# Other backends fall back to an unindexed ILIKE over the same columns.
+import re
+from typing import List, Optional
+
+from sqlalchemy import false, func, literal, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from database.models import Assignment, Course
+from database.search import SEARCH_COLUMNS, TS_CONFIG, tsvector_sql
+
+# Upper bound on hits returned per entity type by the search endpoint
+MAX_SEARCH_RESULTS = 50
+# bm25 column weights, in SEARCH_COLUMNS order (title/name matches rank highest)
+_BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+def fts5_query(term: str) -> Optional[str]:
+    """Quote every word of term as a prefix token so user input never reaches FTS5 query syntax"""
+    words = _WORD.findall(term)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+def _substring_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _matches(db: Session, model, term: str):
+    """SELECT (id, rank) of every model row matching term; higher rank is more relevant"""
+    table_name = model.__tablename__
+    columns = [getattr(model, name) for name in SEARCH_COLUMNS[table_name]]
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        fts_name = f"{table_name}_fts"
+        fts = table(fts_name)
+        query = fts5_query(term)
+        if query is None:
+            return select(model.id, literal(0.0).label("rank")).where(false())
+        # bm25() is lower-is-better; negate it so every dialect sorts rank descending
+        rank = -func.bm25(literal_column(fts_name), *_BM25_WEIGHTS)
+        return select(literal_column("rowid").label("id"), rank.label("rank")).select_from(fts).where(
+            literal_column(fts_name).op("MATCH")(query)
+        )
+
+    substring = columns[0].ilike(_substring_pattern(term), escape="\\")
+    if dialect == "postgresql":
+        # Literal SQL so the expression matches the GIN index definition exactly
+        document = literal_column(tsvector_sql(table_name))
+        ts_query = func.websearch_to_tsquery(literal_column(f"'{TS_CONFIG}'"), term)
+        rank = func.ts_rank(document, ts_query) + func.similarity(columns[0], term)
+        return select(model.id, rank.label("rank")).where(or_(document.op("@@")(ts_query), substring))
+
+    return select(model.id, literal(0.0).label("rank")).where(
+        or_(*(column.ilike(_substring_pattern(term), escape="\\") for column in columns))
+    )
+
+def assignment_search_filter(db: Session, term: str):
+    """Predicate restricting an Assignment query to rows matching term (the search= parameter)"""
+    matches = _matches(db, Assignment, term).subquery()
+    return Assignment.id.in_(select(matches.c.id))
+
+def search_assignments(db: Session, user_id: int, term: str, limit: int = MAX_SEARCH_RESULTS) -> List:
+    """The user's best-matching assignments as rows of list-response columns plus rank"""
+    matches = _matches(db, Assignment, term).subquery()
+    return db.execute(
+        select(Assignment.id, Assignment.title, Assignment.due_date, Assignment.course_id, matches.c.rank)
+        .join(matches, matches.c.id == Assignment.id)
+        .join(Course, Course.id == Assignment.course_id)
+        .where(Course.user_id == user_id)
+        .order_by(matches.c.rank.desc(), Assignment.id)
+        .limit(limit)
+    ).all()
+
+def search_courses(db: Session, user_id: int, term: str, limit: int = MAX_SEARCH_RESULTS) -> List:
+    """The user's best-matching courses as rows of course-response columns plus rank"""
+    matches = _matches(db, Course, term).subquery()
+    return db.execute(
+        select(
+            Course.id, Course.name, Course.term, Course.description,
+            Course.created_at, Course.updated_at, matches.c.rank
+        )
+        .join(matches, matches.c.id == Course.id)
+        .where(Course.user_id == user_id)
+        .order_by(matches.c.rank.desc(), Course.id)
+        .limit(limit)
+    ).all()
@@ -0,0 +1,347 @@
+"""
+Materialized user/course statistics (NFRE-1.1)
+user_stats and course_stats hold running counts and assignment_due_histogram holds one row
+per course per due day. Course/assignment CRUD applies the statement lists built here in
+the same transaction as the write, so reads never scan a user's assignments: time-relative
+buckets are summed from the histogram, and only the two boundary days (today and today + 7)
+are counted exactly from assignments.
+
+Rebuild from the source tables (backfill / drift repair):
+
+    cd backend
+    python -m crud.stats                 # every user
+    python -m crud.stats --user-id 42    # one user
+    python -m crud.stats --check         # report drift without writing
+"""
+import argparse
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import Date, and_, case, exists, func, literal, or_, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database.models import Assignment, AssignmentDueHistogram, Course, CourseStats, User, UserStats
+from utils.cache import CACHE_TIME_RELATIVE_TTL, cached, invalidate_on_commit
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE support
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Status buckets reported by the statistics endpoints
+STATUS_COUNT_KEYS = ("total", "overdue", "due_soon", "upcoming")
+# due_soon covers due dates from now up to this far ahead
+DUE_SOON_WINDOW = timedelta(days=7)
+
+
+def status_count_columns(now: datetime) -> list:
+    """Conditional COUNT columns labelled with STATUS_COUNT_KEYS, relative to `now`"""
+    soon_threshold = now + DUE_SOON_WINDOW
+    return [
+        func.count(Assignment.id).label("total"),
+        func.count(case((Assignment.due_date < now, Assignment.id))).label("overdue"),
+        func.count(case(
+            (and_(Assignment.due_date >= now, Assignment.due_date <= soon_threshold), Assignment.id)
+        )).label("due_soon"),
+        func.count(case((Assignment.due_date > soon_threshold, Assignment.id))).label("upcoming"),
+    ]
+
+
+def due_day(due_date: datetime) -> date:
+    """Histogram bucket of a due date (UTC calendar day, matching naive UTC storage)"""
+    if due_date.tzinfo is not None:
+        due_date = due_date.astimezone(timezone.utc)
+    return due_date.date()
+
+
+# --- Write side: statement builders ---
+
+def _increment(db, table, key: dict, deltas: dict, insert_values: Optional[dict] = None) -> list:
+    """Add `deltas` to the row identified by `key`, creating it when missing"""
+    values = {**key, **(insert_values or {}), **deltas}
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(table).values(**values)
+        return [stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column: table.c[column] + stmt.excluded[column] for column in deltas}
+        )]
+
+    # Portable fallback: UPDATE, then INSERT ... SELECT only if the row still does not exist
+    match = [table.c[column] == value for column, value in key.items()]
+    return [
+        table.update().where(*match).values({column: table.c[column] + delta for column, delta in deltas.items()}),
+        table.insert().from_select(
+            list(values),
+            select(*(literal(value) for value in values.values())).where(~exists().where(*match))
+        ),
+    ]
+
+
+def data_changed(db, user_id: int) -> list:
+    """
+    Bump users.data_version, which list ETags are derived from, and mark the user's cached
+    reads stale once the transaction commits; every builder below includes it
+    """
+    invalidate_on_commit(db, user_id)
+    users = User.__table__
+    return [users.update().where(users.c.id == user_id).values(data_version=users.c.data_version + 1)]
+
+
+def course_created(db, user_id: int, course_id: int) -> list:
+    return [
+        *data_changed(db, user_id),
+        CourseStats.__table__.insert().values(course_id=course_id, user_id=user_id, assignment_count=0),
+        *_increment(db, UserStats.__table__, {"user_id": user_id}, {"course_count": 1}, {"assignment_count": 0}),
+    ]
+
+
+def course_deleted(db, user_id: int, course_id: int) -> list:
+    """Must run before the course row (and its cascaded assignments) is deleted"""
+    course_total = select(CourseStats.assignment_count).where(CourseStats.course_id == course_id).scalar_subquery()
+    return [
+        *data_changed(db, user_id),
+        UserStats.__table__.update().where(UserStats.user_id == user_id).values(
+            course_count=UserStats.course_count - 1,
+            assignment_count=UserStats.assignment_count - func.coalesce(course_total, 0),
+        ),
+        AssignmentDueHistogram.__table__.delete().where(AssignmentDueHistogram.course_id == course_id),
+        CourseStats.__table__.delete().where(CourseStats.course_id == course_id),
+    ]
+
+
+def _histogram_delta(db, user_id: int, course_id: int, day: date, delta: int) -> list:
+    table = AssignmentDueHistogram.__table__
+    statements = _increment(
+        db, table, {"course_id": course_id, "due_day": day}, {"assignment_count": delta}, {"user_id": user_id}
+    )
+    if delta < 0:
+        # Keep the histogram compact: drop buckets that fell to zero
+        statements.append(table.delete().where(
+            table.c.course_id == course_id, table.c.due_day == day, table.c.assignment_count <= 0
+        ))
+    return statements
+
+
+def assignments_changed(db, user_id: int, course_id: int, due_date: datetime, delta: int = 1) -> list:
+    """`delta` assignments due at `due_date` were added to (positive) or removed from (negative) a course"""
+    return [
+        *data_changed(db, user_id),
+        *_increment(db, UserStats.__table__, {"user_id": user_id}, {"assignment_count": delta}, {"course_count": 0}),
+        *_increment(db, CourseStats.__table__, {"course_id": course_id}, {"assignment_count": delta}, {"user_id": user_id}),
+        *_histogram_delta(db, user_id, course_id, due_day(due_date), delta),
+    ]
+
+
+def day_counts_changed(db, user_id: int, day_counts: list) -> list:
+    """
+    Bulk counterpart of assignments_changed: `day_counts` holds (course_id, due_day, delta)
+    triples, so a move is a +n triple for the new day and a -n triple for the old one
+    """
+    per_course = {}
+    for course_id, _, delta in day_counts:
+        per_course[course_id] = per_course.get(course_id, 0) + delta
+    statements = data_changed(db, user_id)
+    total = sum(per_course.values())
+    if total:
+        statements += _increment(db, UserStats.__table__, {"user_id": user_id}, {"assignment_count": total}, {"course_count": 0})
+    for course_id, delta in per_course.items():
+        if delta:
+            statements += _increment(db, CourseStats.__table__, {"course_id": course_id}, {"assignment_count": delta}, {"user_id": user_id})
+    # Increments first, so no bucket is dropped at zero while a move into it is still pending
+    for course_id, day, delta in sorted(day_counts, key=lambda triple: triple[2] < 0):
+        statements += _histogram_delta(db, user_id, course_id, day, delta)
+    return statements
+
+
+def due_date_moved(db, user_id: int, course_id: int, old_due_date: datetime, new_due_date: datetime) -> list:
+    old_day, new_day = due_day(old_due_date), due_day(new_due_date)
+    if old_day == new_day:
+        return data_changed(db, user_id)
+    return [
+        *data_changed(db, user_id),
+        *_histogram_delta(db, user_id, course_id, new_day, 1),
+        *_histogram_delta(db, user_id, course_id, old_day, -1),
+    ]
+
+
+def apply(db: Session, statements: list) -> None:
+    """Execute maintenance statements in the caller's transaction"""
+    for statement in statements:
+        db.execute(statement)
+
+
+async def apply_async(db, statements: list) -> None:
+    """AsyncSession counterpart of apply"""
+    for statement in statements:
+        await db.execute(statement)
+
+
+# --- Read side ---
+
+@cached("user-counts")
+def get_user_counts(db: Session, user_id: int) -> dict:
+    """
+    Course and assignment totals from one primary-key lookup. Cached: /auth/profile has no
+    ETag, so without a shared cache tier other workers may serve it up to CACHE_LOCAL_TTL stale
+    """
+    row = db.execute(
+        select(UserStats.course_count, UserStats.assignment_count).where(UserStats.user_id == user_id)
+    ).first()
+    return {"courses": row.course_count if row else 0, "total": row.assignment_count if row else 0}
+
+
+@cached("user-stats", ttl=CACHE_TIME_RELATIVE_TTL)
+def get_user_stats(db: Session, user_id: int, now: Optional[datetime] = None) -> dict:
+    """
+    Same shape as crud.assignment.get_assignment_stats, read from the materialized tables:
+    per-course counts from course_stats, whole-day buckets from the histogram, and exact
+    counts only for assignments due on today's and the due-soon cutoff's calendar days.
+    Cached; its ETag routes key it by data_version, other callers accept CACHE_LOCAL_TTL of
+    cross-worker staleness without a shared cache tier
+    """
+    now = now or datetime.now(timezone.utc)
+    today = due_day(now)
+    cutoff_day = due_day(now + DUE_SOON_WINDOW)
+
+    histogram = AssignmentDueHistogram
+    whole_days = select(
+        func.coalesce(func.sum(case((histogram.due_day < today, histogram.assignment_count))), 0).label("overdue"),
+        func.coalesce(func.sum(case(
+            (and_(histogram.due_day > today, histogram.due_day < cutoff_day), histogram.assignment_count)
+        )), 0).label("due_soon"),
+        func.coalesce(func.sum(case((histogram.due_day > cutoff_day, histogram.assignment_count))), 0).label("upcoming"),
+    ).where(histogram.user_id == user_id).subquery("whole_days")
+
+    def day_range(day: date):
+        start = datetime.combine(day, time.min)
+        return and_(Assignment.due_date >= start, Assignment.due_date < start + timedelta(days=1))
+
+    boundary_days = (
+        select(*status_count_columns(now))
+        .join(Course, Course.id == Assignment.course_id)
+        .where(Course.user_id == user_id, or_(day_range(today), day_range(cutoff_day)))
+        .subquery("boundary_days")
+    )
+
+    # Both bucket aggregates are single-row derived tables joined onto every course row,
+    # so the whole read is one round trip (a user without courses has no assignments)
+    course_rows = db.execute(
+        select(
+            CourseStats.course_id, Course.name, CourseStats.assignment_count,
+            *((whole_days.c[key] + boundary_days.c[key]).label(key) for key in ("overdue", "due_soon", "upcoming"))
+        )
+        .join(Course, Course.id == CourseStats.course_id)
+        .join(whole_days, true())
+        .join(boundary_days, true())
+        .where(CourseStats.user_id == user_id)
+        .order_by(CourseStats.course_id)
+    ).all()
+    buckets = course_rows[0] if course_rows else None
+
+    return {
+        "total": sum(row.assignment_count for row in course_rows),
+        "overdue": buckets.overdue if buckets else 0,
+        "due_soon": buckets.due_soon if buckets else 0,
+        "upcoming": buckets.upcoming if buckets else 0,
+        "courses": len(course_rows),
+        "by_course": [
+            {"course_id": row.course_id, "course_name": row.name, "count": row.assignment_count}
+            for row in course_rows if row.assignment_count
+        ],
+    }
+
+
+# --- Rebuild ---
+
+def rebuild_stats(db: Session, user_id: Optional[int] = None) -> None:
+    """Recompute the materialized tables from courses/assignments (caller commits)"""
+    if user_id is not None:
+        invalidate_on_commit(db, user_id)
+    tables = (AssignmentDueHistogram, CourseStats, UserStats)
+    for model in tables:
+        delete = model.__table__.delete()
+        if user_id is not None:
+            delete = delete.where(model.user_id == user_id)
+        db.execute(delete)
+
+    def scoped(query):
+        return query if user_id is None else query.where(Course.user_id == user_id)
+
+    db.execute(CourseStats.__table__.insert().from_select(
+        ["course_id", "user_id", "assignment_count"],
+        scoped(
+            select(Course.id, Course.user_id, func.count(Assignment.id))
+            .outerjoin(Assignment, Assignment.course_id == Course.id)
+            .group_by(Course.id, Course.user_id)
+        )
+    ))
+
+    day = func.date(Assignment.due_date, type_=Date)
+    db.execute(AssignmentDueHistogram.__table__.insert().from_select(
+        ["course_id", "due_day", "user_id", "assignment_count"],
+        scoped(
+            select(Assignment.course_id, day, Course.user_id, func.count(Assignment.id))
+            .join(Course, Course.id == Assignment.course_id)
+            .group_by(Assignment.course_id, day, Course.user_id)
+        )
+    ))
+
+    per_user = select(
+        CourseStats.user_id, func.count(CourseStats.course_id), func.sum(CourseStats.assignment_count)
+    ).group_by(CourseStats.user_id)
+    if user_id is not None:
+        per_user = per_user.where(CourseStats.user_id == user_id)
+    db.execute(UserStats.__table__.insert().from_select(
+        ["user_id", "course_count", "assignment_count"], per_user
+    ))
+
+
+def find_drift(db: Session, user_ids: List[int]) -> List[str]:
+    """Compare materialized stats with a full aggregate scan for each user"""
+    from crud.assignment import get_assignment_stats
+
+    now = datetime.now(timezone.utc)
+    problems = []
+    for uid in user_ids:
+        expected = get_assignment_stats(db, uid, now=now)
+        actual = get_user_stats.uncached(db, uid, now=now)
+        counts = get_user_counts.uncached(db, uid)
+        if actual != expected or counts != {"courses": expected["courses"], "total": expected["total"]}:
+            problems.append(f"user {uid}: expected {expected}, materialized {actual} / {counts}")
+    return problems
+
+
+def main() -> int:
+    from database.base import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild or verify the materialized statistics tables")
+    parser.add_argument("--user-id", type=int, default=None, help="Only this user (default: everyone)")
+    parser.add_argument("--check", action="store_true", help="Report drift instead of rebuilding")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.check:
+            user_ids = [args.user_id] if args.user_id is not None else list(
+                db.scalars(select(Course.user_id).distinct())
+            )
+            problems = find_drift(db, user_ids)
+            for problem in problems:
+                print(problem)
+            print(f"Checked {len(user_ids)} users, {len(problems)} with drift")
+            return 1 if problems else 0
+
+        rebuild_stats(db, args.user_id)
+        db.commit()
+        print("Rebuilt statistics" + (f" for user {args.user_id}" if args.user_id is not None else ""))
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# CRUD operations for User registration/login
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from database.models import User
+from crud.returning import commit_detached, supports_returning, update_returning
+from utils.identity_cache import identity_cache
+from datetime import datetime
+from typing import Optional
+
+# Dialects with INSERT ... ON CONFLICT ... RETURNING support
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def update_user_profile(db: Session, user_id: int, values: dict) -> Optional[User]:
+    """Apply profile changes and return the updated row (UPDATE ... RETURNING where supported)"""
+    values = dict(values, updated_at=datetime.utcnow())
+    if supports_returning(db):
+        user = commit_detached(db, update_returning(db, User, [User.id == user_id], values))
+        # Core UPDATEs bypass the ORM events that evict cached identities
+        identity_cache.invalidate(user_id=user_id)
+        return user
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return None
+    for field, value in values.items():
+        setattr(user, field, value)
+    # Committing evicts the cached identity
+    db.commit()
+    db.refresh(user)
+    return user
+
+def upsert_firebase_user(db: Session, firebase_user: dict, logged_in_at: datetime) -> User:
+    """
+    Create the user for verified Firebase claims, or touch last_login if the email exists
+    Runs as a single INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING, so concurrent
+    first logins for the same email cannot trip the unique constraint
+    """
+    full_name = firebase_user.get("name") or firebase_user["email"].split("@")[0]
+    values = dict(
+        email=firebase_user["email"],
+        firebase_uid=firebase_user["uid"],
+        full_name=full_name,
+        photo_url=firebase_user.get("picture"),
+        created_at=logged_in_at,
+        last_login=logged_in_at,
+        is_active=True
+    )
+
+    dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        return _get_or_create_user(db, values)
+
+    stmt = dialect_insert(User).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={
+            "last_login": stmt.excluded.last_login,
+            "firebase_uid": func.coalesce(User.firebase_uid, stmt.excluded.firebase_uid),
+        }
+    ).returning(User)
+
+    try:
+        # RETURNING already loaded every column, so no refresh after commit
+        return commit_detached(db, db.scalars(stmt).one())
+    except IntegrityError:
+        # The uid is already linked to another email - log in as that row
+        db.rollback()
+        user = update_returning(db, User, [User.firebase_uid == firebase_user["uid"]], {"last_login": logged_in_at})
+        if user is None:
+            raise
+        return commit_detached(db, user)
+
+def _get_or_create_user(db: Session, values: dict) -> User:
+    """Fallback for dialects without ON CONFLICT support"""
+    user = db.query(User).filter(User.email == values["email"]).first()
+    if user:
+        user.last_login = values["last_login"]
+        if not user.firebase_uid:
+            user.firebase_uid = values["firebase_uid"]
+    else:
+        user = User(**values)
+        db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
@@ -0,0 +1,98 @@
+"""Initial schema: users, courses, assignments, drafts, feedback
+
+Databases created earlier with Base.metadata.create_all() should be stamped
+at this revision (`alembic stamp 0001`) before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-06-22
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String()),
+        sa.Column("full_name", sa.String()),
+        sa.Column("photo_url", sa.String(), nullable=True),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=True),
+        sa.Column("role", sa.String(length=32)),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_full_name", "users", ["full_name"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "courses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("term", sa.String()),
+        sa.Column("description", sa.Text()),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_courses_id", "courses", ["id"])
+    op.create_index("ix_courses_name", "courses", ["name"])
+    op.create_index("ix_courses_term", "courses", ["term"])
+
+    op.create_table(
+        "assignments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String()),
+        sa.Column("description", sa.Text()),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("due_date", sa.DateTime(), nullable=False),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_assignments_id", "assignments", ["id"])
+    op.create_index("ix_assignments_title", "assignments", ["title"])
+
+    op.create_table(
+        "drafts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("content", sa.Text()),
+        sa.Column("version", sa.Integer()),
+        sa.Column("assignment_id", sa.Integer(), sa.ForeignKey("assignments.id")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_drafts_id", "drafts", ["id"])
+
+    op.create_table(
+        "feedback",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("content", sa.Text()),
+        sa.Column("ai_feedback_json", sa.Text()),
+        sa.Column("draft_id", sa.Integer(), sa.ForeignKey("drafts.id")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_feedback_id", "feedback", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("feedback")
+    op.drop_table("drafts")
+    op.drop_table("assignments")
+    op.drop_table("courses")
+    op.drop_table("users")
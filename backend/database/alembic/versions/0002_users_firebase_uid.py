@@ -0,0 +1,27 @@
+"""Add users.firebase_uid for identity lookups by token uid
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("firebase_uid", sa.String(length=128), nullable=True))
+    op.create_index("ix_users_firebase_uid", "users", ["firebase_uid"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_firebase_uid", table_name="users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("firebase_uid")
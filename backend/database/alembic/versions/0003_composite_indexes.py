@@ -0,0 +1,50 @@
+"""Composite indexes for the hot list/stats queries (NFRE-1.4)
+
+On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY so the tables
+stay writable during the migration; that cannot run inside a transaction, hence
+the autocommit block.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_assignments_course_id_due_date", "assignments", ["course_id", "due_date"]),
+    ("ix_courses_user_id_created_at", "courses", ["user_id", "created_at"]),
+    ("ix_drafts_assignment_id_version", "drafts", ["assignment_id", "version"]),
+    ("ix_feedback_draft_id", "feedback", ["draft_id"]),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table)
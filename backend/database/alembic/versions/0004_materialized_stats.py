@@ -0,0 +1,72 @@
+"""Materialized user/course statistics and due-date histogram (NFRE-1.1)
+
+Creates user_stats, course_stats and assignment_due_histogram and backfills them
+from the existing courses/assignments. `python -m crud.stats` performs the same
+rebuild later for drift repair.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("course_count", sa.Integer(), nullable=False),
+        sa.Column("assignment_count", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "course_stats",
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("assignment_count", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_course_stats_user_id", "course_stats", ["user_id"])
+    op.create_table(
+        "assignment_due_histogram",
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("due_day", sa.Date(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("assignment_count", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_assignment_due_histogram_user_id_due_day", "assignment_due_histogram", ["user_id", "due_day"]
+    )
+
+    # Backfill
+    op.execute(
+        "INSERT INTO course_stats (course_id, user_id, assignment_count) "
+        "SELECT courses.id, courses.user_id, COUNT(assignments.id) "
+        "FROM courses LEFT OUTER JOIN assignments ON assignments.course_id = courses.id "
+        "GROUP BY courses.id, courses.user_id"
+    )
+    op.execute(
+        "INSERT INTO assignment_due_histogram (course_id, due_day, user_id, assignment_count) "
+        "SELECT assignments.course_id, DATE(assignments.due_date), courses.user_id, COUNT(assignments.id) "
+        "FROM assignments JOIN courses ON courses.id = assignments.course_id "
+        "GROUP BY assignments.course_id, DATE(assignments.due_date), courses.user_id"
+    )
+    op.execute(
+        "INSERT INTO user_stats (user_id, course_count, assignment_count) "
+        "SELECT user_id, COUNT(course_id), SUM(assignment_count) FROM course_stats GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assignment_due_histogram_user_id_due_day", table_name="assignment_due_histogram")
+    op.drop_table("assignment_due_histogram")
+    op.drop_index("ix_course_stats_user_id", table_name="course_stats")
+    op.drop_table("course_stats")
+    op.drop_table("user_stats")
@@ -0,0 +1,93 @@
+"""Full-text search indexes for assignments and courses (FRE-2.1, NFRE-1.4)
+
+PostgreSQL: pg_trgm, GIN indexes over the tsvector expressions used by crud/search.py
+and trigram GIN indexes on assignments.title / courses.name, built CONCURRENTLY.
+SQLite: external-content FTS5 tables kept in sync by triggers, populated from the
+existing rows. Same objects as database/search.py creates for create_all.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = {
+    "assignments": ("title", "description", "prompt"),
+    "courses": ("name", "term", "description"),
+}
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _tsvector(table: str) -> str:
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS[table])
+    return f"to_tsvector('english', {document})"
+
+
+def _upgrade_postgres() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCH_COLUMNS.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search "
+                f"ON {table} USING gin (({_tsvector(table)}))"
+            )
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{columns[0]}_trgm "
+                f"ON {table} USING gin ({columns[0]} gin_trgm_ops)"
+            )
+
+
+def _upgrade_sqlite() -> None:
+    for table, columns in SEARCH_COLUMNS.items():
+        fts = f"{table}_fts"
+        names = ", ".join(columns)
+        insert_new = (
+            f"INSERT INTO {fts}(rowid, {names}) "
+            f"VALUES (new.id, {', '.join(f'new.{column}' for column in columns)});"
+        )
+        delete_old = (
+            f"INSERT INTO {fts}({fts}, rowid, {names}) "
+            f"VALUES ('delete', old.id, {', '.join(f'old.{column}' for column in columns)});"
+        )
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{names}, content='{table}', content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END")
+        op.execute(f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END")
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {delete_old} {insert_new} END"
+        )
+        # Backfill
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    if _is_postgres():
+        _upgrade_postgres()
+    elif op.get_bind().dialect.name == "sqlite":
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for table, columns in SEARCH_COLUMNS.items():
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_search")
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{columns[0]}_trgm")
+    elif op.get_bind().dialect.name == "sqlite":
+        for table in SEARCH_COLUMNS:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
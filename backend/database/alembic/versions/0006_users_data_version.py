@@ -0,0 +1,28 @@
+"""Add users.data_version, the per-user counter behind list ETags
+
+Bumped in the same transaction as every course/assignment write (crud/stats.py), so
+conditional GETs compare one primary-key lookup instead of re-reading the list.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("data_version")
@@ -1,8 +1,11 @@
 import os
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
+from database.pool_metrics import instrumented_pool_class
 
 # Load environment variables
 load_dotenv()
@@ -10,10 +13,37 @@ load_dotenv()
 # Get DATABASE_URL from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 
+# Connection pool settings (NFRE-2.2)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds before a connection is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[-1] in ("", "/"))
+
+def engine_options(url: str, pool_class=QueuePool, pool_name: str = "primary") -> dict:
+    """create_engine keyword arguments for a database URL, with an instrumented pool"""
+    options = {}
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+        if _is_memory_sqlite(url):
+            # In-memory SQLite keeps SQLAlchemy's single-connection pool
+            return options
+
+    options.update(
+        poolclass=instrumented_pool_class(pool_class, pool_name),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -21,10 +51,59 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
-# Dependency to get DB session
-def get_db():
+# Dependency to get DB session (always the primary; see database/routing.py for reads)
+def get_db(request: Request):
     db = SessionLocal()
+    # Lets database.routing pin this user's reads to the primary after a write
+    principal = getattr(request.state, "principal", None) or {}
+    db.info["principal_uid"] = principal.get("uid")
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# --- Async engine (asyncpg for Postgres, aiosqlite for local SQLite) ---
+# Built lazily so sync-only deployments do not need the async drivers installed
+
+def _to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver"""
+    scheme, sep, rest = url.partition("://")
+    driver = {
+        "postgres": "postgresql+asyncpg",
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+        "sqlite": "sqlite+aiosqlite",
+        "sqlite+pysqlite": "sqlite+aiosqlite",
+    }.get(scheme, scheme)
+    return f"{driver}{sep}{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
+
+_async_engine = None
+_async_session_factory = None
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+        options = engine_options(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, "async")
+        options.pop("connect_args", None)
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **options)
+    return _async_engine
+
+def AsyncSessionLocal():
+    """Create an AsyncSession bound to the async engine"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        # expire_on_commit=False: attribute access after commit must not trigger implicit IO
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory()
+
+# Dependency to get an async DB session (for `async def` routes)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
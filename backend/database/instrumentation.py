@@ -0,0 +1,143 @@
+"""
+Per-request SQL instrumentation
+Engine events count statements and DB time for the current request; QueryStatsMiddleware
+exposes them as response headers (opt-in) and logs slow queries/requests.
+assert_max_queries gives tests a query budget so N+1 regressions fail CI
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Add X-DB-* timing headers to every response
+SQL_STATS_HEADERS = os.getenv("SQL_STATS_HEADERS", "false").lower() in ("1", "true", "yes")
+QUERY_STATS_HEADERS = ("X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Slowest-Ms")
+# Log any single statement slower than this (milliseconds)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Log requests whose total DB time exceeds this (milliseconds)
+SLOW_REQUEST_DB_MS = float(os.getenv("SLOW_REQUEST_DB_MS", "500"))
+
+
+class QueryStats:
+    """Statement count, total DB time and slowest statement for one unit of work"""
+
+    def __init__(self, label: str = "", keep_statements: bool = False):
+        self.label = label
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def headers(self) -> List[tuple]:
+        values = (str(self.count), f"{self.total_ms:.2f}", f"{self.slowest_ms:.2f}")
+        return [(name.lower().encode(), value.encode()) for name, value in zip(QUERY_STATS_HEADERS, values)]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Callbacks receiving each finished request's stats (used by assert_max_queries)
+_request_listeners: List[Callable[[QueryStats], None]] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {statement}")
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting QueryStats for each HTTP request"""
+
+    def __init__(self, app, add_headers: bool = SQL_STATS_HEADERS):
+        self.app = app
+        self.add_headers = add_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        stats = QueryStats(label, keep_statements=bool(_request_listeners))
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start" and self.add_headers:
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + stats.headers()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            if stats.total_ms >= SLOW_REQUEST_DB_MS:
+                logger.warning(
+                    f"Slow DB request {label}: {stats.count} queries, {stats.total_ms:.1f} ms "
+                    f"(slowest {stats.slowest_ms:.1f} ms: {stats.slowest_statement})"
+                )
+            for listener in list(_request_listeners):
+                listener(stats)
+
+
+@contextmanager
+def count_queries(label: str = ""):
+    """Collect QueryStats for code run directly inside the block"""
+    stats = QueryStats(label, keep_statements=True)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Test helper: fail if any request served inside the block (or the block's own code)
+    issues more than `limit` SQL statements
+
+        with assert_max_queries(3):
+            client.get("/assignments/stats", headers=auth_headers)
+    """
+    finished: List[QueryStats] = []
+    _request_listeners.append(finished.append)
+    try:
+        with count_queries("direct") as direct:
+            yield finished
+    finally:
+        _request_listeners.remove(finished.append)
+
+    over_budget = [stats for stats in finished + [direct] if stats.count > limit]
+    if over_budget:
+        details = "\n".join(
+            f"{stats.label}: {stats.count} queries\n    " + "\n    ".join(stats.statements or [])
+            for stats in over_budget
+        )
+        raise AssertionError(f"Query budget of {limit} exceeded:\n{details}")
@@ -1,14 +1,19 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, DateTime
+from sqlalchemy import Boolean, Column, Date, ForeignKey, Index, Integer, String, Text, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 
 from .base import Base
 
+def _utcnow():
+    return datetime.now(timezone.utc)
+
 class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
+    firebase_uid = Column(String(128), unique=True, index=True, nullable=True)  # Identity lookups by token uid
     full_name = Column(String, index=True)  # Added for profile
     photo_url = Column(String, nullable=True)  # Added for profile photo
     username = Column(String, unique=True, index=True, nullable=True)
@@ -16,6 +21,7 @@ class User(Base):
     role = Column(String(32), default="student")  # Default role
     is_active = Column(Boolean, default=True)
     last_login = Column(DateTime(timezone=True), nullable=True)  # Added missing last_login field
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on course/assignment writes (ETags)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -24,13 +30,19 @@ class User(Base):
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        # Every course listing filters by owner and sorts by creation time (NFRE-1.4)
+        Index("ix_courses_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)  # Course name
     term = Column(String, index=True)
     description = Column(Text, default="")
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Now required - user must own course
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Python-side default keeps ORM-inserted values in the same stored format as keyset
+    # cursor binds (SQLite's CURRENT_TIMESTAMP text drops the microseconds)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
@@ -39,6 +51,10 @@ class Course(Base):
 
 class Assignment(Base):
     __tablename__ = "assignments"
+    __table_args__ = (
+        # Per-course lookups ordered / range-filtered by due date (NFRE-1.4)
+        Index("ix_assignments_course_id_due_date", "course_id", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -46,7 +62,7 @@ class Assignment(Base):
     prompt = Column(Text, nullable=False)  # Assignment instructions/prompt
     due_date = Column(DateTime, nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())  # see Course.created_at
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
@@ -55,6 +71,9 @@ class Assignment(Base):
 
 class Draft(Base):
     __tablename__ = "drafts"
+    __table_args__ = (
+        Index("ix_drafts_assignment_id_version", "assignment_id", "version"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text)
@@ -69,6 +88,9 @@ class Draft(Base):
 
 class Feedback(Base):
     __tablename__ = "feedback"
+    __table_args__ = (
+        Index("ix_feedback_draft_id", "draft_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text)
@@ -78,4 +100,40 @@ class Feedback(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    draft = relationship("Draft", back_populates="feedback")
\ No newline at end of file
+    draft = relationship("Draft", back_populates="feedback")
+
+# --- Materialized statistics (NFRE-1.1) ---
+# Maintained by crud.stats in the same transaction as the course/assignment write;
+# `python -m crud.stats` rebuilds them from the source tables
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    course_count = Column(Integer, nullable=False, default=0)
+    assignment_count = Column(Integer, nullable=False, default=0)
+
+class CourseStats(Base):
+    __tablename__ = "course_stats"
+    __table_args__ = (
+        Index("ix_course_stats_user_id", "user_id"),
+    )
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    assignment_count = Column(Integer, nullable=False, default=0)
+
+class AssignmentDueHistogram(Base):
+    """Assignment count per course per due day; time-relative buckets are summed from these rows"""
+    __tablename__ = "assignment_due_histogram"
+    __table_args__ = (
+        Index("ix_assignment_due_histogram_user_id_due_day", "user_id", "due_day"),
+    )
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    due_day = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    assignment_count = Column(Integer, nullable=False, default=0)
+
+# Full-text search indexes / FTS5 tables hook into the tables' create events
+from . import search  # noqa: E402,F401
@@ -0,0 +1,95 @@
+"""
+Connection pool telemetry (NFRE-2.2)
+Pool classes built here time every checkout so /health/ready can tell pool starvation
+apart from slow queries
+"""
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# Upper bounds (milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS: List[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class PoolMetrics:
+    """Checkout wait-time histogram and timeout counter for one pool"""
+
+    def __init__(self, buckets_ms: List[float] = WAIT_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            for i, bound in enumerate(self.buckets_ms):
+                if wait_ms <= bound:
+                    self._counts[i] += 1
+                    break
+            else:
+                self._counts[-1] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{bound:g}ms" for bound in self.buckets_ms] + ["gt_{:g}ms".format(self.buckets_ms[-1])]
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / attempts, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "wait_histogram": dict(zip(labels, self._counts)),
+            }
+
+
+class _TimedCheckout:
+    """Mixin timing QueuePool._do_get, the point where a caller waits for a free connection"""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - start) * 1000)
+        return connection
+
+
+# Metrics per engine name ("primary", "async", ...)
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def instrumented_pool_class(base_pool_class, name: str):
+    """
+    Return a subclass of `base_pool_class` that reports checkout waits under `name`
+    Metrics live on the class so they survive pool.recreate() after dispose/invalidate
+    """
+    metrics = pool_metrics.setdefault(name, PoolMetrics())
+    return type(f"Instrumented{base_pool_class.__name__}", (_TimedCheckout, base_pool_class), {"metrics": metrics})
+
+
+def pool_status(engine) -> dict:
+    """Live checked-in / checked-out / overflow counts for an engine's pool"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    for key, attr in (("size", "size"), ("checked_in", "checkedin"), ("checked_out", "checkedout"), ("overflow", "overflow")):
+        getter = getattr(pool, attr, None)
+        if callable(getter):
+            status[key] = getter()
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
@@ -0,0 +1,155 @@
+"""
+Read-replica session routing
+Read-only routes take their session from get_read_db, which picks a replica round-robin.
+Writes stay on the primary, and so do reads from a user who wrote recently
+(read-your-writes) or when every replica lags behind the configured limit
+"""
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from database.base import SessionLocal, engine_options
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated replica URLs; empty means every read goes to the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# Replicas lagging more than this many seconds are skipped
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+# How often each replica's lag is re-measured
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "10"))
+# Seconds after a write during which that user's reads stay on the primary
+DB_READ_YOUR_WRITES_WINDOW = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "5"))
+
+# Replay lag in seconds; 0 when the replica has applied everything it received (or is not a standby)
+_POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    """Round-robin over replica engines, skipping replicas that lag too far behind"""
+
+    def __init__(self, urls: List[str], max_lag: float = DB_REPLICA_MAX_LAG,
+                 check_interval: float = DB_REPLICA_LAG_CHECK_INTERVAL):
+        self.engines = [
+            create_engine(url, **engine_options(url, pool_name=f"replica{i}"))
+            for i, url in enumerate(urls)
+        ]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._order = itertools.cycle(range(len(self.engines)))
+        self._lag: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    def choose(self):
+        """Next healthy replica engine, or None to fall back to the primary"""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._order)
+            if self.lag(index) <= self.max_lag:
+                return self.engines[index]
+        self.fallbacks += 1
+        return None
+
+    def lag(self, index: int) -> float:
+        measured = self._lag.get(index)
+        if measured is not None and time.monotonic() - measured[1] < self.check_interval:
+            return measured[0]
+
+        engine = self.engines[index]
+        try:
+            if engine.dialect.name == "postgresql":
+                with engine.connect() as connection:
+                    lag = float(connection.execute(_POSTGRES_LAG_QUERY).scalar() or 0)
+            else:
+                # Stand-in replicas (e.g. a second SQLite file) have no replication lag to measure
+                lag = 0.0
+        except Exception as e:
+            logger.warning(f"Replica {index} lag check failed: {str(e)}")
+            lag = float("inf")
+
+        self._lag[index] = (lag, time.monotonic())
+        return lag
+
+    def status(self) -> List[dict]:
+        return [
+            {"replica": index, "lag_seconds": self._lag.get(index, (None,))[0]}
+            for index in range(len(self.engines))
+        ]
+
+
+class RecentWriters:
+    """Firebase uids that committed a write within the read-your-writes window"""
+
+    def __init__(self, window: float = DB_READ_YOUR_WRITES_WINDOW):
+        self.window = window
+        self._last_write: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, uid: str) -> None:
+        with self._lock:
+            self._last_write[uid] = time.monotonic()
+            if len(self._last_write) > 10000:
+                self._prune()
+
+    def is_recent(self, uid: Optional[str]) -> bool:
+        if uid is None:
+            return False
+        last_write = self._last_write.get(uid)
+        return last_write is not None and time.monotonic() - last_write < self.window
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.window
+        self._last_write = {uid: ts for uid, ts in self._last_write.items() if ts >= cutoff}
+
+
+replicas = ReplicaSet(DATABASE_REPLICA_URLS) if DATABASE_REPLICA_URLS else None
+recent_writers = RecentWriters()
+
+
+# --- Write tracking on primary sessions ---
+# get_db tags each session with the caller's uid; a commit that wrote anything pins that
+# user's reads to the primary for DB_READ_YOUR_WRITES_WINDOW seconds
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_orm_write(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_recent_writer(session):
+    if session.info.pop("has_writes", False) and session.info.get("principal_uid"):
+        recent_writers.mark(session.info["principal_uid"])
+
+
+# Dependency to get a session for read-only routes
+def get_read_db(request: Request):
+    principal = getattr(request.state, "principal", None) or {}
+    replica_engine = None
+    if replicas is not None and not recent_writers.is_recent(principal.get("uid")):
+        replica_engine = replicas.choose()
+
+    db: Session = SessionLocal(bind=replica_engine) if replica_engine is not None else SessionLocal()
+    db.info["principal_uid"] = principal.get("uid")
+    # Replica reads may lag a write other workers already see; utils.cache keeps them local
+    db.info["replica"] = replica_engine is not None
+    try:
+        yield db
+    finally:
+        db.close()
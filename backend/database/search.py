@@ -0,0 +1,66 @@
+"""
+Full-text search indexes (FRE-2.1, NFRE-1.4)
+PostgreSQL: GIN indexes over a tsvector expression per table, plus pg_trgm GIN indexes on
+the title/name columns for substring matches. The indexes are expressions over the base
+columns, so Postgres keeps them in sync on every write.
+SQLite: external-content FTS5 tables (assignments_fts, courses_fts) maintained by triggers.
+
+The statements are attached to the tables' after_create events so create_all builds them;
+migration 0005 creates the same objects on migrated databases.
+"""
+from sqlalchemy import DDL, event
+
+from .models import Assignment, Course
+
+# Text search configuration of the tsvector expressions; queries must use the same one
+TS_CONFIG = "english"
+
+# Searchable columns per table; the first column carries the highest ranking weight
+SEARCH_COLUMNS = {
+    "assignments": ("title", "description", "prompt"),
+    "courses": ("name", "term", "description"),
+}
+
+
+def tsvector_sql(table: str) -> str:
+    """tsvector expression indexed for `table` (search queries must repeat it verbatim)"""
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS[table])
+    return f"to_tsvector('{TS_CONFIG}', {document})"
+
+
+def postgresql_ddl(table: str) -> list:
+    title = SEARCH_COLUMNS[table][0]
+    return [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING gin (({tsvector_sql(table)}))",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{title}_trgm ON {table} USING gin ({title} gin_trgm_ops)",
+    ]
+
+
+def sqlite_ddl(table: str) -> list:
+    columns = SEARCH_COLUMNS[table]
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+        # Index rows that existed before the FTS table
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+for _model in (Assignment, Course):
+    _table = _model.__tablename__
+    for _statement in postgresql_ddl(_table):
+        event.listen(_model.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+    for _statement in sqlite_ddl(_table):
+        event.listen(_model.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    event.listen(_model.__table__, "after_drop", DDL(f"DROP TABLE IF EXISTS {_table}_fts").execute_if(dialect="sqlite"))
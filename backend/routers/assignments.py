@@ -1,31 +1,54 @@
 # FastAPI router for Assignment management - FRE-2.1, 2.2, 2.3
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from database.base import get_db
+from database.routing import get_read_db
 from schemas.assignment import (
     AssignmentCreate, 
     AssignmentUpdate, 
     AssignmentResponse, 
-    AssignmentListResponse
+    AssignmentListResponse,
+    AssignmentImportResponse,
+    AssignmentSelection,
+    AssignmentBulkShift,
+    AssignmentBulkUpdate,
+    AssignmentBulkResult,
+    ASSIGNMENT_FIELDS,
+    ASSIGNMENT_LIST_FIELDS,
+    assignment_stats_response,
+    project_assignments
 )
 from crud.assignment import (
     get_assignments_by_course,
-    get_assignment_by_id,
+    get_owned_assignment,
     create_assignment,
-    update_assignment,
-    delete_assignment,
+    bulk_create_assignments,
+    shift_owned_assignments,
+    update_owned_assignments,
+    delete_owned_assignments,
+    update_owned_assignment,
+    delete_owned_assignment,
     get_upcoming_assignments,
     get_overdue_assignments,
-    get_assignments_by_user
+    get_assignments_by_user,
+    paginate_assignments,
+    assignment_columns
 )
-from database.models import Assignment, Course, User
-from sqlalchemy import func
+from crud.search import assignment_search_filter
+from crud.stats import get_user_stats
+from database.models import Assignment, Course
 from datetime import datetime, timedelta, timezone
 import logging
 
 # Import the new authentication middleware
 from utils.auth_middleware import get_current_user, get_current_user_id
+from utils.identity_cache import CurrentUser
+from utils.pagination import NEXT_CURSOR_HEADER, InvalidCursor
+from utils.fieldsets import FIELDS_DESCRIPTION, InvalidFields, parse_fields
+from utils.serialization import list_response
+from utils.conditional import check_not_modified
+from utils.bulk_import import SUPPORTED_TYPES, BulkImportError, parse_rows, validate_rows
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -37,42 +60,18 @@ router = APIRouter(prefix="/assignments", tags=["assignments"])
 
 @router.get("/stats", response_model=dict)
 def get_assignment_statistics(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get assignment statistics and analytics for the current user"""
+    """Get assignment statistics and analytics for the current user (materialized counters, NFRE-1.1)"""
     try:
-        now = datetime.now(timezone.utc)
-        soon_threshold = now + timedelta(days=7)
-        
-        # Filter assignments by user's courses
-        user_assignments = db.query(Assignment).join(Course).filter(
-            Course.user_id == current_user.id
-        )
-        
-        total_assignments = user_assignments.count()
-        overdue_count = user_assignments.filter(Assignment.due_date < now).count()
-        due_soon_count = user_assignments.filter(
-            Assignment.due_date >= now,
-            Assignment.due_date <= soon_threshold
-        ).count()
-        upcoming_count = user_assignments.filter(Assignment.due_date > soon_threshold).count()
-        
-        # Course distribution for user's courses
-        course_stats = db.query(
-            Course.name,
-            func.count(Assignment.id).label('assignment_count')
-        ).join(Assignment).filter(
-            Course.user_id == current_user.id
-        ).group_by(Course.id, Course.name).all()
+        not_modified = check_not_modified(request, response, db, current_user.id, "assignment-stats", time_relative=True)
+        if not_modified:
+            return not_modified
         
-        return {
-            "total_assignments": total_assignments,
-            "overdue": overdue_count,
-            "due_soon": due_soon_count,
-            "upcoming": upcoming_count,
-            "by_course": [{"course_name": stat[0], "count": stat[1]} for stat in course_stats]
-        }
+        return assignment_stats_response(get_user_stats(db, current_user.id))
         
     except Exception as e:
         logger.error(f"Error getting assignment statistics: {str(e)}")
@@ -83,15 +82,29 @@ def get_assignment_statistics(
 
 @router.get("/upcoming", response_model=List[AssignmentListResponse])
 def list_upcoming_assignments(
+    request: Request,
+    response: Response,
     limit: int = 10, 
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get upcoming assignments for the current user's courses"""
     try:
-        assignments = get_upcoming_assignments(db, user_id=current_user.id, limit=limit)
+        not_modified = check_not_modified(request, response, db, current_user.id, "assignments-upcoming", time_relative=True)
+        if not_modified:
+            return not_modified
+        fieldset = parse_fields(fields, ASSIGNMENT_FIELDS)
+        assignments = get_upcoming_assignments(
+            db, user_id=current_user.id, limit=limit, columns=assignment_columns(fieldset or ASSIGNMENT_LIST_FIELDS)
+        )
         logger.info(f"Retrieved {len(assignments)} upcoming assignments for user {current_user.id}")
-        return assignments
+        return list_response(project_assignments(assignments, fieldset or ASSIGNMENT_LIST_FIELDS), response)
+    except InvalidFields as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error listing upcoming assignments: {str(e)}")
         raise HTTPException(
@@ -101,14 +114,28 @@ def list_upcoming_assignments(
 
 @router.get("/overdue", response_model=List[AssignmentListResponse])
 def list_overdue_assignments(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get overdue assignments for the current user's courses"""
     try:
-        assignments = get_overdue_assignments(db, user_id=current_user.id)
+        not_modified = check_not_modified(request, response, db, current_user.id, "assignments-overdue", time_relative=True)
+        if not_modified:
+            return not_modified
+        fieldset = parse_fields(fields, ASSIGNMENT_FIELDS)
+        assignments = get_overdue_assignments(
+            db, user_id=current_user.id, columns=assignment_columns(fieldset or ASSIGNMENT_LIST_FIELDS)
+        )
         logger.info(f"Retrieved {len(assignments)} overdue assignments for user {current_user.id}")
-        return assignments
+        return list_response(project_assignments(assignments, fieldset or ASSIGNMENT_LIST_FIELDS), response)
+    except InvalidFields as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error listing overdue assignments: {str(e)}")
         raise HTTPException(
@@ -118,22 +145,34 @@ def list_overdue_assignments(
 
 @router.get("/", response_model=List[AssignmentListResponse])
 def list_all_assignments(
-    status: Optional[str] = Query(None, description="Filter by status: overdue, due_soon, upcoming"),
+    request: Request,
+    response: Response,
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status: overdue, due_soon, upcoming"),
     course_id: Optional[int] = Query(None, description="Filter by course ID"),
-    search: Optional[str] = Query(None, description="Search assignments by title"),
+    search: Optional[str] = Query(None, description="Full-text search over title, description and prompt"),
     sort_by: str = Query("due_date", description="Sort by: due_date, title, created_at"),
     order: str = Query("asc", description="Sort order: asc, desc"),
-    limit: int = Query(50, le=100, description="Maximum number of assignments to return"),
-    offset: int = Query(0, ge=0, description="Number of assignments to skip"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of assignments to return"),
+    cursor: Optional[str] = Query(None, description=f"Opaque token from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Number of assignments to skip; ignored when a cursor is given"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all assignments for the current user with advanced filtering, search, and sorting (Enhanced FRE-2.1)"""
+    """Get all assignments for the current user with advanced filtering, search, sorting and cursor pagination (Enhanced FRE-2.1)"""
     try:
-        logger.info(f"Listing assignments for user {current_user.id} with filters - status: {status}, course_id: {course_id}, search: {search}")
+        # Unchanged since the client's copy: 304 before any list query runs
+        not_modified = check_not_modified(request, response, db, current_user.id, "assignments", time_relative=True)
+        if not_modified:
+            return not_modified
+        
+        logger.info(f"Listing assignments for user {current_user.id} with filters - status: {status_filter}, course_id: {course_id}, search: {search}")
         
-        # Start with base query - only assignments from user's courses
-        query = db.query(Assignment).join(Course).filter(
+        # Start with base query - only assignments from user's courses, only the columns the response needs
+        fieldset = parse_fields(fields, ASSIGNMENT_FIELDS)
+        query = db.query(*assignment_columns(fieldset or ASSIGNMENT_LIST_FIELDS, sort_by)).join(
+            Course, Course.id == Assignment.course_id
+        ).filter(
             Course.user_id == current_user.id
         )
         
@@ -152,44 +191,38 @@ def list_all_assignments(
             query = query.filter(Assignment.course_id == course_id)
         
         if search:
-            query = query.filter(Assignment.title.ilike(f"%{search}%"))
+            query = query.filter(assignment_search_filter(db, search))
         
         # Apply status filter (computed based on due_date)
-        if status:
+        if status_filter:
             now = datetime.now(timezone.utc)
-            if status == "overdue":
+            if status_filter == "overdue":
                 query = query.filter(Assignment.due_date < now)
-            elif status == "due_soon":
+            elif status_filter == "due_soon":
                 soon_threshold = now + timedelta(days=7)
                 query = query.filter(
                     Assignment.due_date >= now,
                     Assignment.due_date <= soon_threshold
                 )
-            elif status == "upcoming":
+            elif status_filter == "upcoming":
                 soon_threshold = now + timedelta(days=7)
                 query = query.filter(Assignment.due_date > soon_threshold)
         
-        # Apply sorting
-        if sort_by == "due_date":
-            sort_field = Assignment.due_date
-        elif sort_by == "title":
-            sort_field = Assignment.title
-        elif sort_by == "created_at":
-            sort_field = Assignment.created_at
-        else:
-            sort_field = Assignment.due_date
-        
-        if order == "desc":
-            query = query.order_by(sort_field.desc())
-        else:
-            query = query.order_by(sort_field.asc())
-        
-        # Apply pagination
-        assignments = query.offset(offset).limit(limit).all()
+        # Apply sorting (id breaks ties) and keyset pagination
+        assignments, next_cursor = paginate_assignments(query, sort_by, order, limit, cursor, offset=offset)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         
         logger.info(f"Retrieved {len(assignments)} assignments for user {current_user.id}")
-        return assignments
+        return list_response(project_assignments(assignments, fieldset or ASSIGNMENT_LIST_FIELDS), response)
         
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing assignments: {str(e)}")
         raise HTTPException(
@@ -200,26 +233,15 @@ def list_all_assignments(
 @router.post("/", response_model=AssignmentResponse, status_code=status.HTTP_201_CREATED)
 def create_new_assignment(
     assignment: AssignmentCreate, 
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new assignment (FRE-2.2) - only in courses owned by current user"""
     try:
         logger.info(f"Creating assignment: {assignment.title} for course {assignment.course_id} by user {current_user.id}")
         
-        # Verify user owns the course
-        course = db.query(Course).filter(
-            Course.id == assignment.course_id,
-            Course.user_id == current_user.id
-        ).first()
-        
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found or access denied"
-            )
-        
-        db_assignment = create_assignment(db, assignment)
+        # create_assignment verifies the user owns the course in its course lookup
+        db_assignment = create_assignment(db, assignment, user_id=current_user.id)
         logger.info(f"Successfully created assignment with ID: {db_assignment.id}")
         return db_assignment
     except HTTPException:
@@ -231,30 +253,129 @@ def create_new_assignment(
             detail="Failed to create assignment"
         )
 
+async def read_raw_body(request: Request) -> bytes:
+    """Raw request body, read before the sync endpoint runs in the threadpool"""
+    return await request.body()
+
+@router.post("/bulk", response_model=AssignmentImportResponse, status_code=status.HTTP_201_CREATED,
+             openapi_extra={"requestBody": {"required": True, "content": {media_type: {} for media_type in SUPPORTED_TYPES}}})
+def import_assignments(
+    request: Request,
+    partial: bool = Query(False, description="Insert the valid rows even when other rows fail; otherwise any error rejects the batch"),
+    body: bytes = Depends(read_raw_body),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create many assignments in one transaction from a JSON array, CSV or NDJSON upload (FRE-2.2)"""
+    try:
+        rows, errors = parse_rows(body, request.headers.get("content-type", ""))
+        valid, validation_errors = validate_rows(rows)
+        errors += validation_errors
+        logger.info(f"Importing {len(valid)} valid of {len(rows)} assignment rows for user {current_user.id}")
+        
+        created, ids = 0, []
+        if valid and (partial or not errors):
+            # Ownership is checked once per distinct course inside the import
+            created, ids, course_errors = bulk_create_assignments(db, current_user.id, valid, partial=partial)
+            errors += course_errors
+        
+        errors.sort(key=lambda error: error["row"])
+        if errors and not partial:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"message": "No assignments were imported", "errors": errors}
+            )
+        
+        logger.info(f"Imported {created} assignments for user {current_user.id} with {len(errors)} row errors")
+        return AssignmentImportResponse(created=created, ids=ids, errors=errors)
+    except BulkImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error importing assignments: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to import assignments"
+        )
+
+@router.post("/bulk/shift", response_model=AssignmentBulkResult)
+def shift_assignment_due_dates(
+    shift: AssignmentBulkShift,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Move the due dates of the selected assignments by a number of days (FRE-2.3)"""
+    try:
+        # One UPDATE ... WHERE owner AND selection
+        ids = shift_owned_assignments(db, current_user.id, shift, shift.days)
+        logger.info(f"Shifted {len(ids)} assignments by {shift.days} days for user {current_user.id}")
+        return AssignmentBulkResult(affected=len(ids), ids=ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error shifting assignments: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update assignments"
+        )
+
+@router.patch("/bulk", response_model=AssignmentBulkResult)
+def update_assignments_in_bulk(
+    bulk_update: AssignmentBulkUpdate,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Apply the same changes to every selected assignment (FRE-2.3)"""
+    try:
+        ids = update_owned_assignments(db, current_user.id, bulk_update, bulk_update.changes)
+        logger.info(f"Updated {len(ids)} assignments for user {current_user.id}")
+        return AssignmentBulkResult(affected=len(ids), ids=ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating assignments: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update assignments"
+        )
+
+@router.post("/bulk/delete", response_model=AssignmentBulkResult)
+def delete_assignments_in_bulk(
+    selection: AssignmentSelection,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete every selected assignment (FRE-2.3); a POST because DELETE bodies are not reliably forwarded"""
+    try:
+        ids = delete_owned_assignments(db, current_user.id, selection)
+        logger.info(f"Deleted {len(ids)} assignments for user {current_user.id}")
+        return AssignmentBulkResult(affected=len(ids), ids=ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting assignments: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete assignments"
+        )
+
 # NOTE: Place parameterized routes AFTER specific routes
 
 @router.get("/{assignment_id}", response_model=AssignmentResponse)
 def get_assignment(
     assignment_id: int, 
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific assignment by ID - only if user owns the course"""
     try:
-        assignment = get_assignment_by_id(db, assignment_id)
+        # Ownership is part of the query: someone else's assignment is indistinguishable from a missing one
+        assignment = get_owned_assignment(db, current_user.id, assignment_id)
         if not assignment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignment not found"
-            )
-        
-        # Verify user owns the course this assignment belongs to
-        course = db.query(Course).filter(
-            Course.id == assignment.course_id,
-            Course.user_id == current_user.id
-        ).first()
-        
-        if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Assignment not found or access denied"
@@ -274,34 +395,21 @@ def get_assignment(
 def update_existing_assignment(
     assignment_id: int, 
     assignment_update: AssignmentUpdate, 
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update an existing assignment (FRE-2.3) - only if user owns the course"""
     try:
         logger.info(f"Updating assignment {assignment_id} by user {current_user.id}")
         
-        # Get assignment and verify ownership
-        assignment = get_assignment_by_id(db, assignment_id)
-        if not assignment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignment not found"
-            )
-        
-        # Verify user owns the course this assignment belongs to
-        course = db.query(Course).filter(
-            Course.id == assignment.course_id,
-            Course.user_id == current_user.id
-        ).first()
-        
-        if not course:
+        # UPDATE ... WHERE id AND owner - no separate load or ownership query
+        updated_assignment = update_owned_assignment(db, current_user.id, assignment_id, assignment_update)
+        if not updated_assignment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Assignment not found or access denied"
             )
         
-        updated_assignment = update_assignment(db, assignment_id, assignment_update)
         logger.info(f"Successfully updated assignment {assignment_id}")
         return updated_assignment
     except HTTPException:
@@ -316,38 +424,19 @@ def update_existing_assignment(
 @router.delete("/{assignment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_existing_assignment(
     assignment_id: int, 
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete an assignment (FRE-2.3) - only if user owns the course"""
     try:
         logger.info(f"Deleting assignment {assignment_id} by user {current_user.id}")
         
-        # Get assignment and verify ownership
-        assignment = get_assignment_by_id(db, assignment_id)
-        if not assignment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignment not found"
-            )
-        
-        # Verify user owns the course this assignment belongs to
-        course = db.query(Course).filter(
-            Course.id == assignment.course_id,
-            Course.user_id == current_user.id
-        ).first()
-        
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignment not found or access denied"
-            )
-        
-        success = delete_assignment(db, assignment_id)
+        # DELETE ... WHERE id AND owner
+        success = delete_owned_assignment(db, current_user.id, assignment_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignment not found"
+                detail="Assignment not found or access denied"
             )
         
         logger.info(f"Successfully deleted assignment {assignment_id}")
@@ -1,14 +1,21 @@
 # FastAPI router for FRE-1.3 Courses CRUD - Updated with proper authentication
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from database.base import get_db
-from schemas.course import CourseCreate, CourseUpdate, CourseResponse
-from schemas.assignment import AssignmentListResponse  # Add this import
-from crud.course import get_courses, get_course_by_id, create_course, update_course, delete_course
-from crud.assignment import get_assignments_by_course  # Add this import
-from database.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from database.base import get_db, get_async_db
+from database.routing import get_read_db
+from schemas.course import COURSE_FIELDS, CourseCreate, CourseUpdate, CourseResponse, CourseSummaryResponse
+from schemas.assignment import AssignmentListResponse, ASSIGNMENT_FIELDS, ASSIGNMENT_LIST_FIELDS, project_assignments
+from crud.course import get_courses_page, get_course_summaries, get_course_by_id, create_course, update_course, delete_course
+from crud.assignment import assignment_columns, get_assignments_by_course_page
+from crud import async_course
+from utils.identity_cache import CurrentUser
 from utils.auth_middleware import get_current_user
+from utils.pagination import DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER, InvalidCursor
+from utils.conditional import check_not_modified
+from utils.fieldsets import FIELDS_DESCRIPTION, InvalidFields, parse_fields
+from utils.serialization import list_response
 import logging
 
 # Set up logging
@@ -17,16 +24,51 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/courses", tags=["courses"])
 
-@router.get("/", response_model=List[CourseResponse])
+# The ?expand= value of GET /courses/ and the fields it adds to each course
+SUMMARY_EXPANSION = "summary"
+EMPTY_SUMMARY = {"assignment_count": 0, "overdue_count": 0, "next_due": None}
+
+@router.get("/", response_model=List[Union[CourseSummaryResponse, CourseResponse]])
 def list_courses(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit (without a cursor) for every course"),
+    cursor: Optional[str] = Query(None, description=f"Opaque token from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    expand: Optional[str] = Query(None, description="summary: add assignment_count, overdue_count and next_due to each course"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all courses for the authenticated user (FRE-1.3)"""
+    """Get the authenticated user's courses, newest first, optionally cursor-paginated (FRE-1.3)"""
+    if expand not in (None, SUMMARY_EXPANSION):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"expand must be: {SUMMARY_EXPANSION}"
+        )
     try:
-        courses = get_courses(db, user_id=current_user.id)
+        # Overdue counts and next deadlines move with the clock
+        not_modified = check_not_modified(request, response, db, current_user.id, "courses", time_relative=bool(expand))
+        if not_modified:
+            return not_modified
+        
+        if cursor and limit is None:
+            limit = DEFAULT_PAGE_SIZE
+        courses, next_cursor = get_courses_page(db, current_user.id, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         logger.info(f"Retrieved {len(courses)} courses for user {current_user.id}")
+        if expand:
+            # One grouped query for the whole page instead of /courses/{id}/assignments per course
+            summaries = get_course_summaries(db, current_user.id, [course.id for course in courses])
+            return list_response([
+                {**{name: getattr(course, name) for name in COURSE_FIELDS}, **summaries.get(course.id, EMPTY_SUMMARY)}
+                for course in courses
+            ], response)
         return courses
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error listing courses: {str(e)}")
         raise HTTPException(
@@ -37,7 +79,7 @@ def list_courses(
 @router.post("/", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
 def create_new_course(
     course: CourseCreate, 
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new course for the authenticated user (FRE-1.3)"""
@@ -57,14 +99,14 @@ def create_new_course(
         )
 
 @router.get("/{course_id}", response_model=CourseResponse)
-def get_course(
+async def get_course(
     course_id: int, 
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific course by ID - only if user owns it (FRE-1.3)"""
     try:
-        course = get_course_by_id(db, course_id)
+        course = await async_course.get_course_by_id(db, course_id)
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -92,7 +134,7 @@ def get_course(
 def update_existing_course(
     course_id: int, 
     course_update: CourseUpdate, 
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update an existing course - only if user owns it (FRE-1.3)"""
@@ -128,7 +170,7 @@ def update_existing_course(
 @router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_existing_course(
     course_id: int, 
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a course - only if user owns it (FRE-1.3)"""
@@ -169,7 +211,13 @@ def delete_existing_course(
 @router.get("/{course_id}/assignments", response_model=List[AssignmentListResponse])
 def list_course_assignments(
     course_id: int,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    sort_by: str = Query("due_date", description="Sort by: due_date, title, created_at"),
+    order: str = Query("asc", description="Sort order: asc, desc"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit (without a cursor) for every assignment"),
+    cursor: Optional[str] = Query(None, description=f"Opaque token from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all assignments for a specific course - only if user owns the course (FRE-2.1)"""
@@ -188,9 +236,21 @@ def list_course_assignments(
                 detail="Course not found or access denied"
             )
         
-        assignments = get_assignments_by_course(db, course_id)
+        if cursor and limit is None:
+            limit = DEFAULT_PAGE_SIZE
+        fieldset = parse_fields(fields, ASSIGNMENT_FIELDS)
+        assignments, next_cursor = get_assignments_by_course_page(
+            db, course_id, sort_by, order, limit, cursor, columns=assignment_columns(fieldset or ASSIGNMENT_LIST_FIELDS, sort_by)
+        )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         logger.info(f"Retrieved {len(assignments)} assignments for course {course_id}")
-        return assignments
+        return list_response(project_assignments(assignments, fieldset or ASSIGNMENT_LIST_FIELDS), response)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
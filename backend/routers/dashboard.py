@@ -0,0 +1,72 @@
+# FastAPI router for the dashboard's first paint - profile, courses, stats, upcoming and overdue in one request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from database.routing import get_read_db
+from schemas.assignment import ASSIGNMENT_LIST_FIELDS, assignment_stats_response, project_assignments
+from schemas.course import COURSE_FIELDS
+from schemas.dashboard import DashboardResponse
+from schemas.user import profile_response
+from crud.assignment import assignment_columns, get_overdue_assignments, get_upcoming_assignments
+from crud.course import get_courses_page
+from crud.stats import get_user_stats
+from utils.auth_middleware import get_current_user
+from utils.conditional import check_not_modified
+from utils.identity_cache import CurrentUser
+from utils.last_login_buffer import last_login_buffer
+from utils.serialization import list_response
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+# "" rather than "/": /dashboard is served directly instead of redirecting to /dashboard/
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(
+    request: Request,
+    response: Response,
+    upcoming_limit: int = Query(10, ge=1, le=50, description="Maximum number of upcoming assignments"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Composes /auth/profile, /courses/, /assignments/stats, /assignments/upcoming and
+    /assignments/overdue: one token check, one identity lookup, one session, and the
+    sub-reads go through the read cache
+    """
+    try:
+        # Profile fields come from the identity cache, not data_version, so they join the ETag
+        profile = profile_response(current_user, {"courses": 0, "total": 0}, last_login_buffer.pending(current_user.id))
+        collection = f"dashboard:{profile.full_name}:{profile.photo_url}:{profile.last_login}"
+        not_modified = check_not_modified(request, response, db, current_user.id, collection, time_relative=True)
+        if not_modified:
+            return not_modified
+        
+        # get_user_stats carries the profile counts too, so /auth/profile's count query is not repeated
+        stats = get_user_stats(db, current_user.id)
+        profile.courses_count, profile.assignments_count = stats["courses"], stats["total"]
+        
+        courses, _ = get_courses_page(db, current_user.id, None)
+        columns = assignment_columns(ASSIGNMENT_LIST_FIELDS)
+        upcoming = get_upcoming_assignments(db, user_id=current_user.id, limit=upcoming_limit, columns=columns)
+        overdue = get_overdue_assignments(db, user_id=current_user.id, columns=columns)
+        
+        now = datetime.now(timezone.utc)
+        body = {
+            "profile": profile.model_dump(),
+            "courses": [{name: getattr(course, name) for name in COURSE_FIELDS} for course in courses],
+            "stats": assignment_stats_response(stats),
+            "upcoming": project_assignments(upcoming, now=now),
+            "overdue": project_assignments(overdue, now=now),
+        }
+        logger.info(f"Dashboard for user {current_user.id}: {len(courses)} courses, {len(upcoming)} upcoming, {len(overdue)} overdue")
+        return list_response(body, response)
+    except Exception as e:
+        logger.error(f"Error building dashboard for user {current_user.id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve dashboard"
+        )
@@ -0,0 +1,52 @@
+# FastAPI router for full-text search across the user's courses and assignments - FRE-2.1
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from database.routing import get_read_db
+from schemas.assignment import project_assignments
+from schemas.search import ASSIGNMENT_SEARCH_FIELDS, SearchResponse
+from crud.search import MAX_SEARCH_RESULTS, search_assignments, search_courses
+from utils.auth_middleware import get_current_user
+from utils.identity_cache import CurrentUser
+from utils.serialization import list_response
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SEARCH_TYPES = ("all", "assignments", "courses")
+
+@router.get("/", response_model=SearchResponse)
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+    type: str = Query("all", description="What to search: all, assignments, courses"),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS, description="Maximum results per type"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Ranked search over assignment title/description/prompt and course name/term/description"""
+    if type not in SEARCH_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"type must be one of: {', '.join(SEARCH_TYPES)}"
+        )
+    try:
+        result = {"query": q, "assignments": [], "courses": []}
+        if type in ("all", "assignments"):
+            # One pass with one clock read for the computed fields (is_overdue, days_until_due)
+            result["assignments"] = project_assignments(
+                search_assignments(db, current_user.id, q, limit), ASSIGNMENT_SEARCH_FIELDS
+            )
+        if type in ("all", "courses"):
+            result["courses"] = [dict(row._mapping) for row in search_courses(db, current_user.id, q, limit)]
+        logger.info(f"Search for user {current_user.id} matched {len(result['assignments'])} assignments, {len(result['courses'])} courses")
+        return list_response(result, response)
+    except Exception as e:
+        logger.error(f"Error searching: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search"
+        )
@@ -1,6 +1,14 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator, validator
+from typing import List, Optional
 from datetime import datetime, timezone
+from utils.datetimes import naive_utc
+
+def due_status(due_date: datetime, now: datetime) -> tuple:
+    """(is_overdue, days_until_due) for a due date, naive values taken as UTC"""
+    if due_date.tzinfo is None:
+        due_date = due_date.replace(tzinfo=timezone.utc)
+    delta = due_date - now
+    return due_date < now, delta.days if delta.days >= 0 else None
 
 class AssignmentBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200, description="Assignment title")
@@ -18,7 +26,8 @@ class AssignmentBase(BaseModel):
             v = v.replace(tzinfo=timezone.utc)
         if v < now:
             raise ValueError('Due date must be in the future')
-        return v
+        # Stored as naive UTC (the column has no time zone), so every write path binds the same instant
+        return naive_utc(v)
 
 class AssignmentCreate(AssignmentBase):
     pass
@@ -39,6 +48,8 @@ class AssignmentUpdate(BaseModel):
                 v = v.replace(tzinfo=timezone.utc)
             if v < now:
                 raise ValueError('Due date must be in the future')
+            # Stored as naive UTC, like AssignmentBase.due_date
+            v = naive_utc(v)
         return v
 
 class AssignmentResponse(BaseModel):
@@ -61,15 +72,8 @@ class AssignmentResponse(BaseModel):
 
     def __init__(self, **data):
         super().__init__(**data)
-        # Calculate computed fields with timezone-aware comparison
-        now = datetime.now(timezone.utc)
-        due_date = self.due_date
-        if due_date.tzinfo is None:
-            due_date = due_date.replace(tzinfo=timezone.utc)
-        
-        self.is_overdue = due_date < now
-        delta = due_date - now
-        self.days_until_due = delta.days if delta.days >= 0 else None
+        # Single items only; list endpoints compute these per page in project_assignments
+        self.is_overdue, self.days_until_due = due_status(self.due_date, datetime.now(timezone.utc))
 
 class AssignmentListResponse(BaseModel):
     id: int
@@ -85,12 +89,82 @@ class AssignmentListResponse(BaseModel):
 
     def __init__(self, **data):
         super().__init__(**data)
-        # Calculate computed fields with timezone-aware comparison
-        now = datetime.now(timezone.utc)
-        due_date = self.due_date
-        if due_date.tzinfo is None:
-            due_date = due_date.replace(tzinfo=timezone.utc)
-            
-        self.is_overdue = due_date < now
-        delta = due_date - now
-        self.days_until_due = delta.days if delta.days >= 0 else None
\ No newline at end of file
+        # Single items only; list endpoints compute these per page in project_assignments
+        self.is_overdue, self.days_until_due = due_status(self.due_date, datetime.now(timezone.utc))
+
+# Attributes a ?fields= list may name on assignment list endpoints
+ASSIGNMENT_FIELDS = (
+    "id", "title", "description", "prompt", "due_date", "course_id", "created_at", "updated_at",
+    "is_overdue", "days_until_due",
+)
+COMPUTED_FIELDS = ("is_overdue", "days_until_due")
+
+# Fields list endpoints return when no ?fields= is given
+ASSIGNMENT_LIST_FIELDS = tuple(AssignmentListResponse.model_fields)
+
+def project_assignments(rows, fields=ASSIGNMENT_LIST_FIELDS, now: Optional[datetime] = None) -> list:
+    """
+    Response dicts for a page of rows in one pass: `now` is read once for the whole page and
+    stored attributes are copied as-is, with no model built (and validated) per row
+    """
+    now = now or datetime.now(timezone.utc)
+    with_computed = any(name in COMPUTED_FIELDS for name in fields)
+    items = []
+    for row in rows:
+        # Keys follow `fields`, i.e. the response model's field order
+        computed = dict(zip(COMPUTED_FIELDS, due_status(row.due_date, now))) if with_computed else {}
+        items.append({name: computed[name] if name in computed else getattr(row, name) for name in fields})
+    return items
+
+def assignment_stats_response(stats: dict) -> dict:
+    """Shape of GET /assignments/stats from crud.stats.get_user_stats output"""
+    return {
+        "total_assignments": stats["total"],
+        "overdue": stats["overdue"],
+        "due_soon": stats["due_soon"],
+        "upcoming": stats["upcoming"],
+        "by_course": [
+            {"course_name": course["course_name"], "count": course["count"]}
+            for course in stats["by_course"]
+        ]
+    }
+
+class AssignmentImportError(BaseModel):
+    row: int = Field(..., description="Zero-based position of the row in the uploaded batch")
+    field: Optional[str] = None
+    message: str
+
+class AssignmentImportResponse(BaseModel):
+    created: int = 0
+    ids: List[int] = []
+    errors: List[AssignmentImportError] = []
+
+class AssignmentSelection(BaseModel):
+    """Which of the user's assignments a bulk operation applies to; given criteria are combined with AND"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000, description="Assignment IDs")
+    course_id: Optional[int] = Field(None, gt=0, description="Only assignments in this course")
+    due_from: Optional[datetime] = Field(None, description="Only assignments due at or after this time")
+    due_to: Optional[datetime] = Field(None, description="Only assignments due at or before this time")
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        # Never let an empty body select every assignment the user has
+        if self.ids is None and self.course_id is None and self.due_from is None and self.due_to is None:
+            raise ValueError('Select assignments by ids, course_id or a due date range')
+        return self
+
+class AssignmentBulkShift(AssignmentSelection):
+    days: int = Field(..., ge=-366, le=366, description="Days to move each due date by; negative moves earlier")
+
+    @validator('days')
+    def validate_days(cls, v):
+        if v == 0:
+            raise ValueError('days must not be 0')
+        return v
+
+class AssignmentBulkUpdate(AssignmentSelection):
+    changes: AssignmentUpdate
+
+class AssignmentBulkResult(BaseModel):
+    affected: int
+    ids: List[int] = []
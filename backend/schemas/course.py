@@ -25,4 +25,18 @@ class CourseResponse(BaseModel):
 
     model_config = {
         "from_attributes": True
-    }
\ No newline at end of file
+    }
+
+# Keys of a course in hand-built (orjson) responses
+COURSE_FIELDS = tuple(CourseResponse.model_fields)
+
+class NextDue(BaseModel):
+    id: int
+    title: str
+    due_date: datetime
+
+class CourseSummaryResponse(CourseResponse):
+    """A course from GET /courses/?expand=summary; the summary fields are required so plain courses never match"""
+    assignment_count: int
+    overdue_count: int
+    next_due: Optional[NextDue]
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List
+
+from schemas.assignment import AssignmentListResponse
+from schemas.course import CourseResponse
+from schemas.user import UserProfileResponse
+
+class CourseAssignmentCount(BaseModel):
+    course_name: str
+    count: int
+
+class AssignmentStatsSummary(BaseModel):
+    total_assignments: int
+    overdue: int
+    due_soon: int
+    upcoming: int
+    by_course: List[CourseAssignmentCount] = []
+
+class DashboardResponse(BaseModel):
+    profile: UserProfileResponse
+    courses: List[CourseResponse] = []
+    stats: AssignmentStatsSummary
+    upcoming: List[AssignmentListResponse] = []
+    overdue: List[AssignmentListResponse] = []
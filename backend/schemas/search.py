@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+
+from schemas.assignment import AssignmentListResponse
+from schemas.course import CourseResponse
+
+class AssignmentSearchResult(AssignmentListResponse):
+    rank: float
+
+# Keys of each assignment hit, in response order
+ASSIGNMENT_SEARCH_FIELDS = tuple(AssignmentSearchResult.model_fields)
+
+class CourseSearchResult(CourseResponse):
+    rank: float
+
+class SearchResponse(BaseModel):
+    query: str
+    assignments: List[AssignmentSearchResult] = []
+    courses: List[CourseSearchResult] = []
@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class RegisterRequest(BaseModel):
+    # No fields needed - we'll extract user info from the Authorization header
+    pass
+
+class UserResponse(BaseModel):
+    id: int  # Changed from str to int to match database
+    email: str
+    full_name: str
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class UserProfileResponse(BaseModel):
+    id: int  # Changed from str to int
+    email: str
+    full_name: str
+    photo_url: Optional[str] = None
+    created_at: datetime
+    last_login: Optional[datetime] = None
+    courses_count: Optional[int] = 0
+    assignments_count: Optional[int] = 0
+    verified: Optional[bool] = True
+    
+    class Config:
+        from_attributes = True
+
+class UserProfileUpdateRequest(BaseModel):
+    full_name: Optional[str] = None
+    photo_url: Optional[str] = None
+
+def profile_response(user, counts: dict, last_login: Optional[datetime] = None) -> UserProfileResponse:
+    """
+    Profile of a CurrentUser or User row with course/assignment counts (keys "courses" and
+    "total"); last_login, when given, is a login not yet flushed to user.last_login
+    """
+    return UserProfileResponse(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        photo_url=user.photo_url,
+        created_at=user.created_at,
+        last_login=last_login or user.last_login,
+        courses_count=counts["courses"],
+        assignments_count=counts["total"],
+        verified=True  # Since they're authenticated via Firebase
+    )
@@ -0,0 +1,62 @@
+"""
+API tests run the app against a throwaway SQLite file with authentication stubbed out:
+the auth middleware accepts any bearer token and get_current_user is the test user
+"""
+import os
+import sys
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="corepilot-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("FIREBASE_LOCAL_KEYS_FILE", os.path.join(_DB_DIR, "no-keys.json"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import utils.auth_middleware as auth_middleware  # noqa: E402
+from auth_service.main import app  # noqa: E402
+from database.base import Base, SessionLocal, engine  # noqa: E402
+from database.models import User  # noqa: E402
+from utils.cache import configure_cache  # noqa: E402
+from utils.identity_cache import CurrentUser  # noqa: E402
+
+FIREBASE_UID = "test-user"
+
+
+async def _verify_any_token(token):
+    return {"uid": FIREBASE_UID, "email": "test@example.com"}
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    configure_cache()
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="test@example.com", full_name="Test User", firebase_uid=FIREBASE_UID)
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client(user, monkeypatch):
+    monkeypatch.setattr(auth_middleware, "verify_firebase_token", _verify_any_token)
+    current_user = CurrentUser.from_user(user)
+    app.dependency_overrides[auth_middleware.get_current_user] = lambda: current_user
+    yield TestClient(app, headers={"Authorization": "Bearer test"})
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def course(client):
+    response = client.post("/courses/", json={"name": "Algorithms", "term": "Fall"})
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,32 @@
+from datetime import date
+
+from crud import stats
+from database.models import Assignment, AssignmentDueHistogram
+
+
+def test_offset_due_date_stored_as_naive_utc(client, db, user, course):
+    # 02:00 at +05:00 is 21:00 UTC the previous day
+    response = client.post("/assignments/", json={
+        "title": "Essay", "prompt": "Prompt", "due_date": "2030-01-02T02:00:00+05:00", "course_id": course["id"],
+    })
+    assert response.status_code == 201, response.text
+    assert db.query(Assignment).one().due_date.isoformat() == "2030-01-01T21:00:00"
+
+    histogram = db.query(AssignmentDueHistogram).one()
+    assert histogram.due_day == date(2030, 1, 1)
+    assert stats.find_drift(db, [user.id]) == []
+
+
+def test_offset_due_date_update_then_shift(client, db, user, course):
+    response = client.post("/assignments/", json={
+        "title": "Essay", "prompt": "Prompt", "due_date": "2030-01-01T12:00:00Z", "course_id": course["id"],
+    })
+    assignment_id = response.json()["id"]
+
+    response = client.put(f"/assignments/{assignment_id}", json={"due_date": "2030-01-03T01:00:00+02:00"})
+    assert response.status_code == 200, response.text
+    client.post("/assignments/bulk/shift", json={"ids": [assignment_id], "days": 1})
+
+    db.expire_all()
+    assert db.get(Assignment, assignment_id).due_date.isoformat() == "2030-01-03T23:00:00"
+    assert stats.find_drift(db, [user.id]) == []
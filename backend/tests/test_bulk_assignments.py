@@ -0,0 +1,53 @@
+from database.models import Assignment
+
+
+def create_assignments(client, course_id, due_date, count):
+    ids = []
+    for i in range(count):
+        response = client.post("/assignments/", json={
+            "title": f"Assignment {i}", "prompt": "Prompt", "due_date": due_date, "course_id": course_id,
+        })
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+    return ids
+
+
+def page_ids(client, **params):
+    ids, cursor = [], None
+    while True:
+        response = client.get("/assignments/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        ids += [item["id"] for item in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids
+
+
+def test_shift_keeps_stored_format(client, db, course):
+    ids = create_assignments(client, course["id"], "2030-01-01T22:00:00.123456Z", 3)
+
+    response = client.post("/assignments/bulk/shift", json={"course_id": course["id"], "days": 1})
+    assert response.status_code == 200, response.text
+    assert sorted(response.json()["ids"]) == ids
+
+    due_dates = {a.due_date.isoformat() for a in db.query(Assignment).all()}
+    assert due_dates == {"2030-01-02T22:00:00.123456"}
+
+
+def test_cursor_pagination_after_shift(client, course):
+    ids = create_assignments(client, course["id"], "2030-01-01T22:00:00Z", 3)
+    client.post("/assignments/bulk/shift", json={"ids": ids[:2], "days": 1})
+
+    assert page_ids(client, sort_by="due_date", limit=1) == [ids[2], ids[0], ids[1]]
+
+
+def test_exact_range_selects_shifted(client, course):
+    ids = create_assignments(client, course["id"], "2030-01-01T22:00:00Z", 3)
+    client.post("/assignments/bulk/shift", json={"course_id": course["id"], "days": 1})
+
+    response = client.post("/assignments/bulk/delete", json={
+        "due_from": "2030-01-02T22:00:00Z", "due_to": "2030-01-02T22:00:00Z",
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["affected"] == 3
+    assert page_ids(client) == []
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+
+from schemas.course import CourseResponse, CourseSummaryResponse
+
+
+def add_assignment(client, course_id, title, due_in_days):
+    """Create through the API (keeps the stats tables current); past due dates via a bulk shift"""
+    due_date = datetime.now(timezone.utc) + timedelta(days=max(due_in_days, 0), hours=1)
+    response = client.post("/assignments/", json={
+        "title": title, "prompt": "Prompt", "due_date": due_date.isoformat(), "course_id": course_id,
+    })
+    assert response.status_code == 201, response.text
+    if due_in_days < 0:
+        client.post("/assignments/bulk/shift", json={"ids": [response.json()["id"]], "days": due_in_days - 1})
+
+
+def create_course(client, name):
+    response = client.post("/courses/", json={"name": name, "term": "Fall"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_courses_expand_summary(client, course):
+    empty = create_course(client, "Empty")
+    add_assignment(client, course["id"], "Late", -2)
+    add_assignment(client, course["id"], "Later", 5)
+    add_assignment(client, course["id"], "Next", 1)
+
+    response = client.get("/courses/", params={"expand": "summary"})
+    assert response.status_code == 200, response.text
+    by_id = {item["id"]: item for item in response.json()}
+
+    summary = by_id[course["id"]]
+    assert summary["name"] == "Algorithms"
+    assert (summary["assignment_count"], summary["overdue_count"]) == (3, 1)
+    assert summary["next_due"]["title"] == "Next"
+    empty_summary = {key: by_id[empty["id"]][key] for key in ("assignment_count", "overdue_count", "next_due")}
+    assert empty_summary == {"assignment_count": 0, "overdue_count": 0, "next_due": None}
+
+
+def test_courses_rejects_unknown_expand(client):
+    assert client.get("/courses/", params={"expand": "everything"}).status_code == 400
+
+
+def test_courses_expand_summary_paginated(client, course):
+    for name in ("Biology", "Chemistry"):
+        create_course(client, name)
+    add_assignment(client, course["id"], "Next", 1)
+
+    first = client.get("/courses/", params={"expand": "summary", "limit": 2})
+    assert first.status_code == 200, first.text
+    assert [c["name"] for c in first.json()] == ["Chemistry", "Biology"]
+    assert all(c["assignment_count"] == 0 and c["next_due"] is None for c in first.json())
+
+    cursor = first.headers["x-next-cursor"]
+    second = client.get("/courses/", params={"expand": "summary", "limit": 2, "cursor": cursor})
+    assert second.status_code == 200, second.text
+    assert "x-next-cursor" not in second.headers
+    [last] = second.json()
+    assert (last["name"], last["assignment_count"], last["next_due"]["title"]) == ("Algorithms", 1, "Next")
+
+    adapter = TypeAdapter(List[CourseSummaryResponse])
+    for page in (first, second):
+        assert adapter.dump_python(adapter.validate_python(page.json()), mode="json") == page.json()
+
+
+def test_courses_without_expand_omit_summary(client, course):
+    body = client.get("/courses/").json()
+    assert list(body[0]) == list(CourseResponse.model_fields)
+
+
+def test_courses_schema_documents_summary(client):
+    schema = client.get("/openapi.json").json()
+    items = schema["paths"]["/courses/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["items"]
+    assert {"$ref": "#/components/schemas/CourseSummaryResponse"} in items["anyOf"]
+    assert "next_due" in schema["components"]["schemas"]["CourseSummaryResponse"]["required"]
+
+
+def test_dashboard_composes_sections(client, course):
+    add_assignment(client, course["id"], "Late", -2)
+    add_assignment(client, course["id"], "Soon", 1)
+    add_assignment(client, course["id"], "Later", 20)
+
+    response = client.get("/dashboard")
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert body["profile"]["email"] == "test@example.com"
+    assert (body["profile"]["courses_count"], body["profile"]["assignments_count"]) == (1, 3)
+    assert [c["name"] for c in body["courses"]] == ["Algorithms"]
+    assert body["stats"]["total_assignments"] == 3
+    assert (body["stats"]["overdue"], body["stats"]["due_soon"], body["stats"]["upcoming"]) == (1, 1, 1)
+    assert [a["title"] for a in body["upcoming"]] == ["Soon", "Later"]
+    assert [a["title"] for a in body["overdue"]] == ["Late"]
+    assert body["overdue"][0]["is_overdue"] is True
+
+
+def test_dashboard_matches_separate_endpoints(client, course):
+    add_assignment(client, course["id"], "Soon", 1)
+
+    body = client.get("/dashboard").json()
+    assert body["courses"] == client.get("/courses/").json()
+    assert body["upcoming"] == client.get("/assignments/upcoming").json()
+    assert body["stats"] == client.get("/assignments/stats").json()
+
+
+def test_dashboard_not_modified(client, course):
+    etag = client.get("/dashboard").headers["etag"]
+    assert client.get("/dashboard", headers={"If-None-Match": etag}).status_code == 304
+
+    add_assignment(client, course["id"], "New", 3)
+    assert client.get("/dashboard", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,30 @@
+from sqlalchemy import update
+
+from database.base import engine
+from database.models import Course, User
+
+
+def write_from_other_worker(user_id, course_id, name):
+    """A committed write whose generation bump this process never sees"""
+    with engine.begin() as connection:
+        connection.execute(update(Course).where(Course.id == course_id).values(name=name))
+        connection.execute(update(User).where(User.id == user_id).values(data_version=User.data_version + 1))
+
+
+def test_etag_and_cached_body_share_version(client, user, course):
+    first = client.get("/courses/")
+    assert first.json()[0]["name"] == "Algorithms"
+
+    write_from_other_worker(user.id, course["id"], "Data Structures")
+
+    second = client.get("/courses/")
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.json()[0]["name"] == "Data Structures"
+    assert client.get("/courses/", headers={"If-None-Match": second.headers["etag"]}).status_code == 304
+
+
+def test_expanded_summary_follows_version(client, user, course):
+    client.get("/courses/", params={"expand": "summary"})
+    write_from_other_worker(user.id, course["id"], "Data Structures")
+
+    assert client.get("/courses/", params={"expand": "summary"}).json()[0]["name"] == "Data Structures"
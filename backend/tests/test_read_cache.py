@@ -0,0 +1,37 @@
+import fakeredis
+import pytest
+
+from crud.stats import get_user_counts
+from utils import cache as read_cache
+from utils.cache import configure_cache, key_by_data_version
+
+
+@pytest.fixture
+def shared():
+    client = fakeredis.FakeRedis()
+    configure_cache(shared=client)
+    yield client
+    configure_cache()
+
+
+def entry_keys(shared, namespace):
+    return [key for key in shared.keys() if f":{namespace}:".encode() in key]
+
+
+def test_primary_reads_fill_shared_tier(db, user, shared):
+    get_user_counts(db, user.id)
+    assert len(entry_keys(shared, "user-counts")) == 1
+
+
+def test_replica_reads_stay_local(db, user, shared):
+    db.info["replica"] = True
+    get_user_counts(db, user.id)
+    assert entry_keys(shared, "user-counts") == []
+    assert len(read_cache.cache.local) == 1
+
+
+def test_replica_reads_keyed_by_data_version_are_shared(db, user, shared):
+    db.info["replica"] = True
+    key_by_data_version(db, user.id, 3)
+    get_user_counts(db, user.id)
+    assert len(entry_keys(shared, "user-counts")) == 1
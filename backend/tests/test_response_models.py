@@ -0,0 +1,72 @@
+"""
+List routes encode hand-built dicts (utils.serialization.list_response) while their
+response_model only documents the shape, so each body is checked against its model here
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+
+from schemas.assignment import AssignmentListResponse
+from schemas.search import SearchResponse
+
+
+def assert_matches(adapter: TypeAdapter, body):
+    """body has exactly the model's keys, in the model's order, with the model's encoding"""
+    expected = adapter.dump_python(adapter.validate_python(body), mode="json")
+    assert expected == body
+    assert json.dumps(expected) == json.dumps(body)
+
+
+ASSIGNMENT_LIST = TypeAdapter(List[AssignmentListResponse])
+
+
+def create_assignment(client, course_id, title, due_in_days):
+    due_date = datetime.now(timezone.utc) + timedelta(days=max(due_in_days, 0), hours=1)
+    response = client.post("/assignments/", json={
+        "title": title, "prompt": "Prompt", "due_date": due_date.isoformat(), "course_id": course_id,
+    })
+    assert response.status_code == 201, response.text
+    if due_in_days < 0:
+        client.post("/assignments/bulk/shift", json={"ids": [response.json()["id"]], "days": due_in_days - 1})
+
+
+def seed(client, course):
+    create_assignment(client, course["id"], "Essay draft", 2)
+    create_assignment(client, course["id"], "Essay outline", -3)
+
+
+def test_assignments_list_matches_model(client, course):
+    seed(client, course)
+    body = client.get("/assignments/").json()
+    assert len(body) == 2
+    assert_matches(ASSIGNMENT_LIST, body)
+
+
+def test_upcoming_matches_model(client, course):
+    seed(client, course)
+    body = client.get("/assignments/upcoming").json()
+    assert len(body) == 1
+    assert_matches(ASSIGNMENT_LIST, body)
+
+
+def test_overdue_matches_model(client, course):
+    seed(client, course)
+    body = client.get("/assignments/overdue").json()
+    assert len(body) == 1
+    assert_matches(ASSIGNMENT_LIST, body)
+
+
+def test_course_assignments_match_model(client, course):
+    seed(client, course)
+    body = client.get(f"/courses/{course['id']}/assignments").json()
+    assert len(body) == 2
+    assert_matches(ASSIGNMENT_LIST, body)
+
+
+def test_search_matches_model(client, course):
+    seed(client, course)
+    body = client.get("/search/", params={"q": "essay"}).json()
+    assert len(body["assignments"]) == 2
+    assert_matches(TypeAdapter(SearchResponse), body)
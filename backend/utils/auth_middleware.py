@@ -3,31 +3,58 @@ Authentication middleware for extracting current user from Firebase JWT tokens
 Implements NFRE-4.1: All API endpoints must require Firebase JWT authentication
 """
 from fastapi import Depends, HTTPException, status, Request
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database.base import get_db
-from database.models import User
-from utils.firebase_admin import firebase_auth
+from utils.firebase_admin import id_token_verifier
+from utils.identity_cache import CurrentUser, resolve_user
+from utils.token_cache import token_cache
+from utils.token_verifier import TokenVerificationPool, VerificationQueueFull
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
-# HTTP Bearer token scheme
-security = HTTPBearer()
+# HTTP Bearer token scheme (documents auth in OpenAPI; AuthPrincipalMiddleware does the verification)
+security = HTTPBearer(auto_error=False)
+
+# Routes reachable without a bearer token
+PUBLIC_PATHS = {"/", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"}
+PUBLIC_PATH_PREFIXES = ("/health",)
+
+def _verify_token_sync(token: str) -> dict:
+    """
+    Blocking Firebase verification - runs on the verification thread pool
+    """
+    decoded_token = id_token_verifier.verify_id_token(token)
+    firebase_user = {
+        "uid": decoded_token["uid"],
+        "email": decoded_token.get("email"),
+        "name": decoded_token.get("name", ""),
+        "picture": decoded_token.get("picture")
+    }
+    token_cache.put(token, firebase_user, decoded_token.get("exp"))
+    return firebase_user
+
+# Dedicated pool so slow certificate fetches never block the event loop
+verification_pool = TokenVerificationPool(_verify_token_sync)
 
 async def verify_firebase_token(token: str) -> dict:
     """
     Verify Firebase ID token and return user info
+    Verified claims are cached until the token expires (see utils/token_cache.py)
     """
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     try:
-        decoded_token = firebase_auth.verify_id_token(token)
-        return {
-            "uid": decoded_token["uid"],
-            "email": decoded_token.get("email"),
-            "name": decoded_token.get("name", ""),
-            "picture": decoded_token.get("picture")
-        }
+        return await verification_pool.verify(token)
+    except VerificationQueueFull:
+        logger.warning("Firebase token verification queue is full")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry"
+        )
     except Exception as e:
         logger.error(f"Firebase token verification failed: {str(e)}")
         raise HTTPException(
@@ -36,20 +63,86 @@ async def verify_firebase_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"}
         )
 
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    token = authorization[len("Bearer "):].strip()
+    return token or None
+
+class AuthPrincipalMiddleware:
+    """
+    ASGI middleware that verifies the bearer token at most once per request
+    The verified claims are attached as request.state.principal, and requests to protected
+    routes without a valid token are rejected before routing or DB session creation
+    """
+
+    def __init__(self, app, public_paths=PUBLIC_PATHS, public_path_prefixes=PUBLIC_PATH_PREFIXES):
+        self.app = app
+        self.public_paths = set(public_paths)
+        self.public_path_prefixes = tuple(public_path_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        is_public = path in self.public_paths or path.startswith(self.public_path_prefixes)
+        token = _bearer_token(Request(scope).headers.get("Authorization"))
+
+        principal = None
+        if token is not None:
+            try:
+                principal = await verify_firebase_token(token)
+            except HTTPException as e:
+                if not is_public:
+                    await JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)(scope, receive, send)
+                    return
+        elif not is_public:
+            await JSONResponse(
+                {"detail": "Not authenticated"},
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                headers={"WWW-Authenticate": "Bearer"}
+            )(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["principal"] = principal
+        await self.app(scope, receive, send)
+
+async def get_firebase_principal(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> dict:
+    """
+    Verified Firebase claims for this request, as attached by AuthPrincipalMiddleware
+    Falls back to verifying the header here when the middleware is not installed
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
+    if "principal" in request.scope.get("state", {}) or credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    principal = await verify_firebase_token(credentials.credentials)
+    request.state.principal = principal
+    return principal
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    firebase_user: dict = Depends(get_firebase_principal)
+) -> CurrentUser:
     """
     Get current authenticated user from Firebase JWT token
     This replaces the dummy get_current_user_id() function
+    The user record comes from the identity cache, so no DB session is opened on a hit
     """
     try:
-        # Verify the Firebase token
-        firebase_user = await verify_firebase_token(credentials.credentials)
-        
-        # Find user in database by email
-        user = db.query(User).filter(User.email == firebase_user["email"]).first()
+        # Resolve the user by firebase uid (cached per process)
+        user = await resolve_user(firebase_user)
         
         if not user:
             logger.error(f"User not found in database: {firebase_user['email']}")
@@ -78,7 +171,7 @@ async def get_current_user(
         )
 
 async def get_current_user_id(
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> int:
     """
     Get current user ID - convenience function for backward compatibility
@@ -86,24 +179,16 @@ async def get_current_user_id(
     return current_user.id
 
 # Optional dependency - for endpoints that can work with or without auth
-async def get_current_user_optional(
-    request: Request,
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+async def get_current_user_optional(request: Request) -> Optional[CurrentUser]:
     """
     Get current user if authenticated, otherwise return None
     Useful for endpoints that have different behavior for authenticated vs anonymous users
     """
     try:
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return None
-            
-        token = auth_header.split(" ")[1]
-        firebase_user = await verify_firebase_token(token)
-        user = db.query(User).filter(User.email == firebase_user["email"]).first()
+        firebase_user = await get_firebase_principal(request, await security(request))
+        user = await resolve_user(firebase_user)
         
         return user if user and user.is_active else None
         
     except Exception:
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,92 @@
+"""
+Parsing and batch validation for bulk assignment imports (FRE-2.2)
+A request body is a JSON array, CSV with a header row, or NDJSON (one object per line).
+Rows are validated together through one TypeAdapter; a failing row is reported by its
+zero-based position and does not stop the others from being validated.
+"""
+import csv
+import io
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from schemas.assignment import AssignmentCreate
+
+# Largest batch accepted in one request
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "5000"))
+
+JSON_TYPES = ("application/json",)
+CSV_TYPES = ("text/csv", "application/csv")
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+SUPPORTED_TYPES = JSON_TYPES + CSV_TYPES + NDJSON_TYPES
+
+_ROWS_ADAPTER = TypeAdapter(List[AssignmentCreate])
+
+
+class BulkImportError(ValueError):
+    """The body as a whole cannot be read (unknown type, malformed JSON, too many rows)"""
+
+
+def row_error(row: int, message: str, field: Optional[str] = None) -> Dict[str, Any]:
+    return {"row": row, "field": field, "message": message}
+
+
+def parse_rows(body: bytes, content_type: str) -> Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]:
+    """Split the body into (position, raw row) pairs plus errors for rows that are not even objects"""
+    media_type = (content_type or "application/json").split(";")[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise BulkImportError("Body must be UTF-8 encoded") from e
+
+    rows, errors = [], []
+    if media_type in JSON_TYPES:
+        try:
+            items = json.loads(text)
+        except ValueError as e:
+            raise BulkImportError("Body is not valid JSON") from e
+        if not isinstance(items, list):
+            raise BulkImportError("JSON body must be an array of assignments")
+        rows = list(enumerate(items))
+    elif media_type in CSV_TYPES:
+        reader = csv.DictReader(io.StringIO(text))
+        # Empty optional cells mean "not given", so field defaults apply
+        rows = [
+            (position, {key: value for key, value in record.items() if key and value not in ("", None)})
+            for position, record in enumerate(reader)
+        ]
+    elif media_type in NDJSON_TYPES:
+        for position, line in enumerate(line for line in text.splitlines() if line.strip()):
+            try:
+                rows.append((position, json.loads(line)))
+            except ValueError:
+                errors.append(row_error(position, "Line is not valid JSON"))
+    else:
+        raise BulkImportError(f"Unsupported content type {media_type}; use one of: {', '.join(SUPPORTED_TYPES)}")
+
+    if len(rows) + len(errors) > BULK_IMPORT_MAX_ROWS:
+        raise BulkImportError(f"At most {BULK_IMPORT_MAX_ROWS} assignments per request")
+    return rows, errors
+
+
+def validate_rows(rows: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, AssignmentCreate]], List[Dict[str, Any]]]:
+    """Validate every row in one pass; returns the valid rows and per-row errors"""
+    errors = []
+    try:
+        items = _ROWS_ADAPTER.validate_python([raw for _, raw in rows])
+        return list(zip((position for position, _ in rows), items)), errors
+    except ValidationError as e:
+        failed = set()
+        for error in e.errors(include_url=False):
+            index, *loc = error["loc"]
+            failed.add(index)
+            errors.append(row_error(rows[index][0], error["msg"], ".".join(str(part) for part in loc) or None))
+
+    # Second pass over the rows that passed; their validation cannot fail now
+    remaining = [row for index, row in enumerate(rows) if index not in failed]
+    if not remaining:
+        return [], errors
+    items = _ROWS_ADAPTER.validate_python([raw for _, raw in remaining])
+    return list(zip((position for position, _ in remaining), items)), errors
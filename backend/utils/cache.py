@@ -0,0 +1,280 @@
+"""
+Two-tier read-through cache for per-user CRUD reads (NFRE-2.3)
+Tier 1 is an in-process LRU; tier 2 is an optional shared Redis (CACHE_REDIS_URL, e.g.
+redis://cache:6379/0 or unix:///run/redis.sock) that every uvicorn worker reads and fills.
+Keys carry a per-user generation counter. CRUD writes mark the user in the session
+(crud.stats.data_changed) and the generation is bumped once the transaction commits - an
+INCR in Redis, so every worker addresses new keys on its next read. Stale entries are never
+deleted, they simply stop being addressed and age out.
+
+Without Redis, generations live in each process: a write is seen at once by the worker that
+made it and by the others after CACHE_LOCAL_TTL. Routes with an ETag do not depend on that:
+check_not_modified also keys their reads by the users.data_version the tag was derived from
+(key_by_data_version), so a tag and its body always come from the same version. Cached
+reads outside them (the owned-assignment lookup, profile counts) are deliberately allowed
+that CACHE_LOCAL_TTL of cross-worker staleness in exchange for skipping the database; set
+CACHE_REDIS_URL whenever more than one worker runs (WEB_CONCURRENCY) to close it. Such reads
+served by a read replica (database.routing.get_read_db) only fill the local tier: the replica
+may lag a write whose generation bump every worker already sees. Both tiers hold pickled values, so every hit
+returns fresh (detached) objects and nothing is shared between requests. Tests can inject a
+fakeredis client with configure_cache(shared=fakeredis.FakeRedis())
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "corepilot")
+CACHE_LOCAL_MAX_SIZE = int(os.getenv("CACHE_LOCAL_MAX_SIZE", "5000"))
+# Seconds a local entry may be served; bounds cross-worker staleness when there is no Redis
+CACHE_LOCAL_TTL = int(os.getenv("CACHE_LOCAL_TTL", "30"))
+CACHE_SHARED_TTL = int(os.getenv("CACHE_SHARED_TTL", "300"))
+# Lifetime of reads relative to the current time (upcoming/overdue, stats buckets)
+CACHE_TIME_RELATIVE_TTL = int(os.getenv("CACHE_TIME_RELATIVE_TTL", "60"))
+# uvicorn's --workers default; more than one without Redis means per-worker generations
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+class LocalTier:
+    """Bounded LRU of pickled values with per-entry expiry"""
+
+    def __init__(self, max_size: int = CACHE_LOCAL_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.time() + ttl)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TwoTierCache:
+    """Generation-keyed cache: local LRU in front of an optional shared Redis client"""
+
+    def __init__(self, shared=None, local_max_size: int = CACHE_LOCAL_MAX_SIZE, local_ttl: int = CACHE_LOCAL_TTL,
+                 shared_ttl: int = CACHE_SHARED_TTL, prefix: str = CACHE_KEY_PREFIX):
+        self.shared = shared
+        self.local = LocalTier(local_max_size)
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self.prefix = prefix
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared_errors = 0
+
+    def generation(self, user_id: int) -> int:
+        """Current generation of a user's entries; raises if the shared tier is unreachable"""
+        if self.shared is not None:
+            return int(self.shared.get(self._generation_key(user_id)) or 0)
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def bump(self, user_id: int) -> None:
+        """Make every cached read of the user stale"""
+        if self.shared is not None:
+            try:
+                self.shared.incr(self._generation_key(user_id))
+            except Exception as e:
+                # Entries of the old generation stay addressable until their TTL
+                self.shared_errors += 1
+                logger.warning(f"Cache generation bump failed for user {user_id}: {str(e)}")
+            return
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def get_or_load(self, namespace: str, user_id: int, key_parts: Any, loader: Callable[[], Any],
+                    ttl: Optional[int] = None, share: bool = True) -> Any:
+        """Cached value, else loader()'s, stored locally and - when `share` - in the shared tier"""
+        try:
+            generation = self.generation(user_id)
+        except Exception as e:
+            # Without the shared generation a local hit could be stale: read through
+            self.shared_errors += 1
+            logger.warning(f"Cache unavailable, reading through: {str(e)}")
+            return loader()
+
+        digest = hashlib.blake2b(repr(key_parts).encode(), digest_size=16).hexdigest()
+        key = f"{self.prefix}:{namespace}:{user_id}:{generation}:{digest}"
+        local_ttl = min(self.local_ttl, ttl) if ttl else self.local_ttl
+
+        raw = self.local.get(key)
+        if raw is not None:
+            self.hits += 1
+            return pickle.loads(raw)
+
+        if self.shared is not None:
+            try:
+                raw = self.shared.get(key)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Cache read failed for {namespace}: {str(e)}")
+            if raw is not None:
+                self.shared_hits += 1
+                self.local.put(key, raw, local_ttl)
+                return pickle.loads(raw)
+
+        self.misses += 1
+        value = loader()
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.local.put(key, raw, local_ttl)
+        if self.shared is not None and share:
+            try:
+                self.shared.set(key, raw, ex=min(self.shared_ttl, ttl) if ttl else self.shared_ttl)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Cache write failed for {namespace}: {str(e)}")
+        return value
+
+    def clear(self) -> None:
+        """Drop the local tier and local generations (shared entries age out on their own)"""
+        self.local.clear()
+        with self._lock:
+            self._generations.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "shared": self.shared is not None,
+            "local_size": len(self.local),
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "shared_errors": self.shared_errors,
+            "hit_ratio": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def _generation_key(self, user_id: int) -> str:
+        return f"{self.prefix}:gen:{user_id}"
+
+
+def _connect_shared(url: Optional[str]):
+    if not url:
+        return None
+    import redis  # only needed when a shared tier is configured
+    return redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+cache = TwoTierCache(shared=_connect_shared(CACHE_REDIS_URL))
+if CACHE_ENABLED and cache.shared is None and WEB_CONCURRENCY > 1:
+    logger.warning(
+        f"{WEB_CONCURRENCY} workers without CACHE_REDIS_URL: cached reads outside ETag routes "
+        f"may be up to {CACHE_LOCAL_TTL}s stale in other workers"
+    )
+
+
+def configure_cache(shared=None, **options) -> TwoTierCache:
+    """Replace the process-wide cache, e.g. with a fakeredis client in tests"""
+    global cache
+    cache = TwoTierCache(shared=shared, **options)
+    return cache
+
+
+def _key_part(value: Any) -> Any:
+    """Stable, process-independent stand-in for an argument in the cache key"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_part(item) for item in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "__clause_element__"):
+        # Column attributes (projected column lists) repr with their memory address; str is "Model.column"
+        return str(value)
+    return value
+
+
+def cached(namespace: str, ttl: Optional[int] = None):
+    """
+    Read-through caching for a CRUD read taking (db, ..., user_id, ...). The other arguments
+    form the key; calls with user_id None (unscoped reads) are not cached
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(db, *args, **kwargs):
+            bound = signature.bind(db, *args, **kwargs)
+            bound.apply_defaults()
+            user_id = bound.arguments.get("user_id")
+            if not CACHE_ENABLED or user_id is None:
+                return fn(db, *args, **kwargs)
+            key_parts = tuple(
+                (name, _key_part(value)) for name, value in bound.arguments.items() if name not in ("db", "user_id")
+            )
+            version = db.info.get("cache_data_versions", {}).get(user_id)
+            if version is not None:
+                key_parts += (("data_version", version),)
+            # A lagging replica's result must not be shared under a generation that is already
+            # newer than it, unless the key pins the data_version it was read at
+            share = version is not None or not db.info.get("replica", False)
+            return cache.get_or_load(namespace, user_id, key_parts, lambda: fn(db, *args, **kwargs), ttl, share)
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+# --- Invalidation ---
+# Writes record the affected user in the session; generations move only after the commit,
+# so no worker can re-cache uncommitted state under the new generation
+
+def key_by_data_version(db, user_id: int, version: int) -> None:
+    """
+    Key the user's cached reads through db by the data_version an ETag was derived from
+    (utils.conditional.check_not_modified), so the body can never be older than its tag
+    """
+    db.info.setdefault("cache_data_versions", {})[user_id] = version
+
+
+def invalidate_on_commit(db, user_id: int) -> None:
+    """Bump the user's generation when db (Session or AsyncSession) commits"""
+    db.info.setdefault("cache_user_ids", set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_users(session):
+    versions = session.info.get("cache_data_versions", {})
+    for user_id in session.info.pop("cache_user_ids", ()):
+        versions.pop(user_id, None)
+        cache.bump(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("cache_user_ids", None)
@@ -0,0 +1,63 @@
+"""
+Conditional GETs for the list endpoints the frontend polls
+The ETag is derived from the user's data_version (bumped by every course/assignment write,
+see crud.stats.data_changed), the collection and the query string - one primary-key lookup.
+A matching If-None-Match gets a 304 before the list query runs. Collections with
+time-relative fields (is_overdue, days_until_due, stats buckets) also hash a clock bucket,
+so their tags expire every ETAG_TIME_BUCKET_SECONDS even without writes; the tags are weak
+because such a body is equivalent, not byte-identical, within a bucket
+"""
+import hashlib
+import os
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.models import User
+from utils.cache import key_by_data_version
+
+ETAG_TIME_BUCKET_SECONDS = int(os.getenv("ETAG_TIME_BUCKET_SECONDS", "60"))
+# Revalidate on every use; the 304 is what makes that cheap
+CACHE_CONTROL = "private, no-cache"
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    return db.scalar(select(User.data_version).where(User.id == user_id)) or 0
+
+
+def collection_etag(user_id: int, collection: str, version: int, query: str = "", time_relative: bool = False) -> str:
+    parts = [str(user_id), collection, str(version), query]
+    if time_relative:
+        parts.append(str(int(time.time()) // ETAG_TIME_BUCKET_SECONDS))
+    return 'W/"' + hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match header (a list of tags or *)"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in (part.strip() for part in if_none_match.split(","))
+    )
+
+
+def check_not_modified(request: Request, response: Response, db: Session, user_id: int, collection: str,
+                       time_relative: bool = False) -> Optional[Response]:
+    """
+    A 304 response when the client's copy is current; otherwise None, with the ETag and
+    Cache-Control set on the route's response for the full body. The route's cached reads
+    through db are then keyed by the same data_version as the tag
+    """
+    version = get_data_version(db, user_id)
+    key_by_data_version(db, user_id, version)
+    etag = collection_etag(user_id, collection, version, request.url.query, time_relative)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,12 @@
+"""
+Datetime normalization
+Assignment due dates live in a timestamp-without-time-zone column holding UTC. Every value
+bound to it (writes, range criteria) goes through naive_utc so an offset never reaches the
+database as wall-clock time - asyncpg rejects aware values outright
+"""
+from datetime import datetime, timezone
+
+
+def naive_utc(value: datetime) -> datetime:
+    """value as naive UTC; naive values are taken to be UTC already"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
@@ -0,0 +1,27 @@
+"""
+Sparse fieldsets for list endpoints
+?fields=id,title,prompt names the attributes each item carries - fewer than the default
+response model or more. Endpoints turn the names into the columns they SELECT, so Text
+columns nobody asked for never leave the database
+"""
+from typing import Iterable, Optional, Tuple
+
+FIELDS_DESCRIPTION = "Comma-separated attributes to return per item (subset or superset of the defaults)"
+
+
+class InvalidFields(ValueError):
+    """fields= names something the endpoint cannot return"""
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """Requested field names in request order without duplicates; None when fields= was not given"""
+    if fields is None:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    if not names:
+        raise InvalidFields("fields must name at least one field")
+    allowed = tuple(allowed)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}; allowed: {', '.join(allowed)}")
+    return names
@@ -1,8 +1,30 @@
 import firebase_admin
 from firebase_admin import credentials, auth as firebase_auth
+import json
 import os
+from utils.local_token_verifier import FIREBASE_LOCAL_KEYS_FILE, LocalTokenVerifier
+
+FIREBASE_ADMIN_CREDENTIAL = os.getenv("FIREBASE_ADMIN_CREDENTIAL")
+# "local" verifies ID tokens offline against cached signing keys, "admin" defers to the Admin SDK
+FIREBASE_TOKEN_VERIFIER = os.getenv("FIREBASE_TOKEN_VERIFIER", "local")
 
 # Initialize Firebase Admin SDK only once
-if not firebase_admin._apps:
-    cred = credentials.Certificate(os.getenv("FIREBASE_ADMIN_CREDENTIAL"))
+# A local key file is enough for tests and benchmarks, so credentials are optional there
+if not firebase_admin._apps and (FIREBASE_ADMIN_CREDENTIAL or not FIREBASE_LOCAL_KEYS_FILE):
+    cred = credentials.Certificate(FIREBASE_ADMIN_CREDENTIAL)
     firebase_admin.initialize_app(cred)
+
+def _resolve_project_id():
+    project_id = os.getenv("FIREBASE_PROJECT_ID")
+    if project_id or not FIREBASE_ADMIN_CREDENTIAL:
+        return project_id
+    with open(FIREBASE_ADMIN_CREDENTIAL) as f:
+        return json.load(f).get("project_id")
+
+FIREBASE_PROJECT_ID = _resolve_project_id()
+
+# Engine used by utils.auth_middleware to verify ID tokens
+if FIREBASE_TOKEN_VERIFIER == "local" and FIREBASE_PROJECT_ID:
+    id_token_verifier = LocalTokenVerifier(FIREBASE_PROJECT_ID)
+else:
+    id_token_verifier = firebase_auth
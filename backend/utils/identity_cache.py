@@ -0,0 +1,170 @@
+"""
+Per-process identity cache mapping Firebase uids to slim user records
+Lets the auth dependencies resolve the caller without a database round trip
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from starlette.concurrency import run_in_threadpool
+
+from database.base import SessionLocal
+from database.models import User
+
+# Seconds a cached identity may be served; bounds staleness across uvicorn workers
+IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", "300"))
+IDENTITY_CACHE_MAX_SIZE = int(os.getenv("IDENTITY_CACHE_MAX_SIZE", "10000"))
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Slim, session-independent view of the authenticated user"""
+    id: int
+    email: str
+    full_name: Optional[str]
+    photo_url: Optional[str]
+    role: Optional[str]
+    is_active: bool
+    firebase_uid: Optional[str]
+    created_at: Optional[datetime]
+    last_login: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            photo_url=user.photo_url,
+            role=user.role,
+            is_active=bool(user.is_active),
+            firebase_uid=user.firebase_uid,
+            created_at=user.created_at,
+            last_login=user.last_login,
+        )
+
+
+class IdentityCache:
+    """Bounded LRU of CurrentUser records keyed by Firebase uid"""
+
+    def __init__(self, ttl: int = IDENTITY_CACHE_TTL, max_size: int = IDENTITY_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._uid_by_user_id = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, uid: str) -> Optional[CurrentUser]:
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._remove(uid)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(uid)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, uid: str, user: CurrentUser) -> None:
+        with self._lock:
+            self._remove(uid)
+            self._entries[uid] = (user, time.time() + self.ttl)
+            self._uid_by_user_id[user.id] = uid
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, user_id: Optional[int] = None, uid: Optional[str] = None) -> None:
+        """Drop a cached identity by database id and/or Firebase uid"""
+        with self._lock:
+            if user_id is not None:
+                uid_for_id = self._uid_by_user_id.get(user_id)
+                if uid_for_id:
+                    self._remove(uid_for_id)
+            if uid is not None:
+                self._remove(uid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._uid_by_user_id.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, uid: str) -> None:
+        # Caller must hold the lock
+        entry = self._entries.pop(uid, None)
+        if entry is not None and self._uid_by_user_id.get(entry[0].id) == uid:
+            del self._uid_by_user_id[entry[0].id]
+
+
+identity_cache = IdentityCache()
+
+
+async def resolve_user(firebase_user: dict) -> Optional[CurrentUser]:
+    """
+    Map verified token claims to a CurrentUser, hitting the database only on a cache miss
+    """
+    cached = identity_cache.get(firebase_user["uid"])
+    if cached is not None:
+        return cached
+    return await run_in_threadpool(load_user, firebase_user)
+
+
+def load_user(firebase_user: dict) -> Optional[CurrentUser]:
+    """
+    Load the user row for verified token claims and cache it
+    Lookups go by firebase uid; rows created before the uid column existed are matched by
+    email once and backfilled
+    """
+    uid = firebase_user["uid"]
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.firebase_uid == uid).first()
+        if user is None and firebase_user.get("email"):
+            user = db.query(User).filter(User.email == firebase_user["email"]).first()
+            if user is not None and not user.firebase_uid:
+                user.firebase_uid = uid
+                db.commit()
+        if user is None:
+            return None
+
+        current_user = CurrentUser.from_user(user)
+    finally:
+        db.close()
+
+    identity_cache.put(uid, current_user)
+    return current_user
+
+
+# --- Invalidation ---
+# Any ORM write to a User row (profile updates, logins, deactivation) evicts the cached
+# identity once the transaction commits, so readers never re-cache uncommitted state
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        identity_cache.invalidate(user_id=user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,95 @@
+"""
+Coalesced last_login writes
+Logins record a timestamp in memory and a background thread flushes the latest value per
+user in one batched UPDATE, so login storms do not turn into one write per click
+"""
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam
+
+from database.base import SessionLocal
+from database.models import User
+from utils.identity_cache import identity_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background flushes
+LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", "30"))
+
+
+class LastLoginBuffer:
+    """Keeps the newest pending last_login per user until the next flush"""
+
+    def __init__(self, flush_interval: float = LAST_LOGIN_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, user_id: int, logged_in_at: datetime) -> None:
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None or logged_in_at > current:
+                self._pending[user_id] = logged_in_at
+
+    def pending(self, user_id: int) -> Optional[datetime]:
+        """Buffered login time not yet written to the database"""
+        with self._lock:
+            return self._pending.get(user_id)
+
+    def flush(self) -> int:
+        """Write all buffered logins in one executemany UPDATE; returns rows written"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                User.__table__.update()
+                .where(User.__table__.c.id == bindparam("b_user_id"))
+                .values(last_login=bindparam("b_last_login")),
+                [{"b_user_id": user_id, "b_last_login": ts} for user_id, ts in batch.items()],
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to flush {len(batch)} last_login updates: {str(e)}")
+            # Put the batch back without clobbering newer logins recorded meanwhile
+            for user_id, ts in batch.items():
+                self.record(user_id, ts)
+            return 0
+        finally:
+            db.close()
+
+        # Core UPDATEs bypass ORM events, so evict cached identities explicitly
+        for user_id in batch:
+            identity_cache.invalidate(user_id=user_id)
+        logger.info(f"Flushed {len(batch)} last_login updates")
+        return len(batch)
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="last-login-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer and flush whatever is still buffered"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,246 @@
+"""
+Offline Firebase ID token verification against a locally cached signing-key set
+Google's public certificates are kept in memory and on disk and refreshed in the
+background before their Cache-Control expiry, so no network call sits on the request path
+"""
+import base64
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Dict, Optional
+
+from google.auth import crypt, jwt
+
+logger = logging.getLogger(__name__)
+
+# Public x509 certificates used to sign Firebase ID tokens
+FIREBASE_CERTS_URL = os.getenv(
+    "FIREBASE_CERTS_URL",
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com",
+)
+# On-disk copy of the certificate set, reused across restarts and workers
+FIREBASE_CERT_CACHE_PATH = os.getenv(
+    "FIREBASE_CERT_CACHE_PATH", os.path.join(tempfile.gettempdir(), "firebase_signing_certs.json")
+)
+# Static {kid: PEM} key file for tests and benchmarks; disables all network access
+FIREBASE_LOCAL_KEYS_FILE = os.getenv("FIREBASE_LOCAL_KEYS_FILE")
+# Refresh this many seconds before the certificates' max-age runs out
+CERT_REFRESH_MARGIN = int(os.getenv("FIREBASE_CERT_REFRESH_MARGIN", "300"))
+# Minimum gap between forced refreshes triggered by an unknown key id
+CERT_FORCED_REFRESH_INTERVAL = int(os.getenv("FIREBASE_CERT_FORCED_REFRESH_INTERVAL", "60"))
+TOKEN_CLOCK_SKEW = int(os.getenv("FIREBASE_TOKEN_CLOCK_SKEW", "10"))
+
+DEFAULT_CERT_MAX_AGE = 3600
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class SigningKeySet:
+    """In-memory + on-disk cache of Firebase signing certificates with background refresh"""
+
+    def __init__(
+        self,
+        certs_url: str = FIREBASE_CERTS_URL,
+        cache_path: Optional[str] = FIREBASE_CERT_CACHE_PATH,
+        local_keys_file: Optional[str] = FIREBASE_LOCAL_KEYS_FILE,
+    ):
+        self.certs_url = certs_url
+        self.cache_path = cache_path
+        self.local_keys_file = local_keys_file
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_forced_refresh = 0.0
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def get(self, kid: str) -> Optional[str]:
+        """Return the PEM certificate for a key id"""
+        if not self._certs:
+            self._load()
+
+        cert = self._certs.get(kid)
+        if cert is None and not self.local_keys_file:
+            # Keys rotated ahead of our schedule - refresh once, rate limited
+            now = time.time()
+            if now - self._last_forced_refresh >= CERT_FORCED_REFRESH_INTERVAL:
+                self._last_forced_refresh = now
+                self.refresh()
+                cert = self._certs.get(kid)
+        return cert
+
+    def certs(self) -> Dict[str, str]:
+        if not self._certs:
+            self._load()
+        return dict(self._certs)
+
+    def refresh(self) -> None:
+        """Fetch the certificate set from Google and persist it to disk"""
+        with urllib.request.urlopen(self.certs_url, timeout=10) as response:
+            certs = json.loads(response.read().decode("utf-8"))
+            cache_control = response.headers.get("Cache-Control", "")
+
+        match = _MAX_AGE_PATTERN.search(cache_control)
+        max_age = int(match.group(1)) if match else DEFAULT_CERT_MAX_AGE
+        self._set(certs, time.time() + max_age)
+        self._write_disk_cache()
+        logger.info(f"Refreshed {len(certs)} Firebase signing certificates (max-age {max_age}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._certs:
+                return
+
+            if self.local_keys_file:
+                with open(self.local_keys_file) as f:
+                    self._certs = json.load(f)
+                self._expires_at = float("inf")
+                logger.info(f"Loaded {len(self._certs)} signing keys from {self.local_keys_file}")
+                return
+
+            if not self._read_disk_cache():
+                # Cold start with no usable disk copy - the only blocking fetch
+                self.refresh()
+            self._start_refresher()
+
+    def _set(self, certs: Dict[str, str], expires_at: float) -> None:
+        self._certs = dict(certs)
+        self._expires_at = expires_at
+
+    def _read_disk_cache(self) -> bool:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable certificate cache {self.cache_path}: {str(e)}")
+            return False
+
+        if data.get("expires_at", 0) <= time.time() or not data.get("certs"):
+            return False
+        self._set(data["certs"], data["expires_at"])
+        return True
+
+    def _write_disk_cache(self) -> None:
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"expires_at": self._expires_at, "certs": self._certs}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not persist certificate cache {self.cache_path}: {str(e)}")
+
+    def _start_refresher(self) -> None:
+        if self._refresher is None or not self._refresher.is_alive():
+            self._refresher = threading.Thread(target=self._refresh_loop, name="firebase-cert-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        backoff = 5
+        while not self._stop.is_set():
+            delay = max(self._expires_at - CERT_REFRESH_MARGIN - time.time(), 0)
+            if self._stop.wait(delay):
+                return
+            try:
+                self.refresh()
+                backoff = 5
+            except Exception as e:
+                # Keep serving the current keys and retry with backoff
+                logger.error(f"Firebase certificate refresh failed: {str(e)}")
+                if self._stop.wait(backoff):
+                    return
+                backoff = min(backoff * 2, 300)
+
+
+class LocalTokenVerifier:
+    """Drop-in replacement for firebase_auth.verify_id_token that never calls the network"""
+
+    def __init__(self, project_id: str, key_set: Optional[SigningKeySet] = None):
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.key_set = key_set or SigningKeySet()
+
+    def verify_id_token(self, token: str) -> dict:
+        """Check the RS256 signature and Firebase claims; returns claims with a `uid` key"""
+        header = _decode_header(token)
+        if header.get("alg") != "RS256":
+            raise ValueError(f"Unexpected token algorithm: {header.get('alg')}")
+
+        kid = header.get("kid")
+        cert = self.key_set.get(kid) if kid else None
+        if cert is None:
+            raise ValueError("Token signed with an unknown key")
+
+        claims = jwt.decode(
+            token,
+            certs={kid: cert},
+            audience=self.project_id,
+            clock_skew_in_seconds=TOKEN_CLOCK_SKEW,
+        )
+
+        if claims.get("iss") != self.issuer:
+            raise ValueError(f"Unexpected token issuer: {claims.get('iss')}")
+        subject = claims.get("sub")
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise ValueError("Token has an invalid subject")
+        if claims.get("auth_time", 0) > time.time() + TOKEN_CLOCK_SKEW:
+            raise ValueError("Token auth_time is in the future")
+
+        claims["uid"] = subject
+        return claims
+
+
+def _decode_header(token: str) -> dict:
+    try:
+        segment = token.split(".")[0]
+        segment += "=" * (-len(segment) % 4)
+        return json.loads(base64.urlsafe_b64decode(segment))
+    except (ValueError, IndexError):
+        raise ValueError("Malformed token header")
+
+
+def mint_token(private_key_pem: str, kid: str, project_id: str, uid: str, lifetime: int = 3600, **claims) -> str:
+    """Sign a Firebase-shaped ID token with a local key - for tests and benchmarks"""
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{project_id}",
+        "aud": project_id,
+        "auth_time": now,
+        "sub": uid,
+        "iat": now,
+        "exp": now + lifetime,
+    }
+    payload.update(claims)
+    signer = crypt.RSASigner.from_string(private_key_pem, key_id=kid)
+    return jwt.encode(signer, payload).decode("utf-8")
+
+
+def generate_local_keypair(keys_file: str, kid: str = "local-test-key") -> str:
+    """Write a {kid: public PEM} key file and return the matching private key PEM"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    with open(keys_file, "w") as f:
+        json.dump({kid: public_pem}, f)
+    return private_pem
@@ -0,0 +1,120 @@
+"""
+In-process TTL cache for verified Firebase ID token claims
+Entries are keyed by a SHA-256 hash of the raw token and expire at the token's `exp` claim
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+# Upper bound on cached tokens; least recently used entries are evicted beyond this
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+# Fallback lifetime (seconds) for tokens without an `exp` claim
+TOKEN_CACHE_DEFAULT_TTL = int(os.getenv("TOKEN_CACHE_DEFAULT_TTL", "300"))
+
+
+def hash_token(token: str) -> str:
+    """Return the cache key for a raw bearer token"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """Bounded LRU cache of verified token claims with per-entry expiry"""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE, default_ttl: int = TOKEN_CACHE_DEFAULT_TTL):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._by_uid: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return cached claims for a token, or None if absent or expired"""
+        key = hash_token(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(claims)
+
+    def put(self, token: str, claims: dict, exp: Optional[float] = None) -> None:
+        """Cache verified claims until the token's `exp` claim"""
+        expires_at = float(exp) if exp else time.time() + self.default_ttl
+        if expires_at <= time.time():
+            return
+
+        key = hash_token(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (dict(claims), expires_at)
+            uid = claims.get("uid")
+            if uid:
+                self._by_uid.setdefault(uid, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def revoke(self, token: str) -> bool:
+        """Drop a single token from the cache"""
+        with self._lock:
+            return self._remove(hash_token(token))
+
+    def revoke_uid(self, uid: str) -> int:
+        """Drop every cached token belonging to a Firebase uid"""
+        with self._lock:
+            keys = list(self._by_uid.get(uid, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_uid.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key: str) -> bool:
+        # Caller must hold the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        uid = entry[0].get("uid")
+        if uid and uid in self._by_uid:
+            self._by_uid[uid].discard(key)
+            if not self._by_uid[uid]:
+                del self._by_uid[uid]
+        return True
+
+
+# Shared per-process cache used by the auth dependencies
+token_cache = TokenCache()
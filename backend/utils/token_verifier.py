@@ -0,0 +1,93 @@
+"""
+Async token verification on a dedicated, bounded thread pool
+Keeps blocking signature checks and certificate fetches off the event loop and
+collapses concurrent verifications of the same token into a single call (single-flight)
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from utils.token_cache import hash_token
+
+# Number of threads reserved for token verification
+TOKEN_VERIFY_WORKERS = int(os.getenv("TOKEN_VERIFY_WORKERS", "4"))
+# Maximum verifications waiting for a free thread before new ones are rejected (0 = unbounded)
+TOKEN_VERIFY_MAX_QUEUE = int(os.getenv("TOKEN_VERIFY_MAX_QUEUE", "1000"))
+
+
+class VerificationQueueFull(Exception):
+    """Raised when the verification queue is saturated"""
+
+
+class TokenVerificationPool:
+    """Runs a synchronous verify function on its own executor with single-flight dedup"""
+
+    def __init__(
+        self,
+        verify_fn: Callable[[str], dict],
+        max_workers: int = TOKEN_VERIFY_WORKERS,
+        max_queue: int = TOKEN_VERIFY_MAX_QUEUE,
+    ):
+        self._verify_fn = verify_fn
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="token-verify")
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def verify(self, token: str) -> dict:
+        """Verify a token without blocking the event loop"""
+        key = hash_token(token)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            with self._lock:
+                if self.max_queue and self.queued >= self.max_queue:
+                    self.rejected += 1
+                    raise VerificationQueueFull("Token verification queue is full")
+                self.queued += 1
+
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._run, token)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield so one cancelled waiter does not cancel the shared verification
+        result = await asyncio.shield(future)
+        return dict(result)
+
+    def _run(self, token: str) -> dict:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return self._verify_fn(token)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        """Pool and queue-depth metrics for monitoring"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self.queued,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "inflight": len(self._inflight),
+                "completed": self.completed,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)